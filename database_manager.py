@@ -1,13 +1,65 @@
+from __future__ import annotations
+
 import yaml
 import asyncio
-from typing import Dict, Any, List
+import hashlib
+import os
+import time
+import pickle
+import random
+import re
+import functools
+from functools import cached_property
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Literal
 from contextlib import asynccontextmanager, contextmanager
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
-from sqlalchemy import create_engine, Engine, text, inspect
-from sqlalchemy.engine.url import URL
-from pydantic import BaseModel, model_validator
+from sqlalchemy import TextClause, event, text
+from sqlalchemy.engine import Row
+from sqlalchemy.engine.url import URL, make_url
+from sqlalchemy.pool import StaticPool
+from pydantic import BaseModel, ConfigDict, ValidationError, model_validator
 from password_provider import PasswordProvider, PassPasswordProvider
 
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+DatabaseType = Literal["postgresql", "mysql", "sqlserver", "snowflake", "sqlite"]
+
+_DIALECT_MAP = {
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "sqlserver": "mssql+pyodbc",
+    "snowflake": "snowflake",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_ASYNC_PREFIX_MAP = (
+    ("sqlite://", "sqlite+aiosqlite://"),
+    ("postgresql://", "postgresql+asyncpg://"),
+    ("mysql://", "mysql+aiomysql://"),
+)
+
+# Connection-local only; journal_mode=WAL would rewrite the user's database file
+_SQLITE_PRAGMAS = (
+    "synchronous=NORMAL",
+    "cache_size=-20000",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+)
+
+_SchemaCacheKey = tuple[str, str | TextClause, tuple]
+_ResultCacheKey = tuple[str, str, int]
+_LEADING_COMMENTS = re.compile(r"(?:\s*(?:--[^\n]*|/\*.*?\*/))*\s*", re.DOTALL)
+_READ_QUERY = re.compile(r"(select|with|show|describe)\b", re.IGNORECASE)
+_SIDE_EFFECTS = re.compile(
+    r"\b(into|insert|update|delete|merge|nextval|setval|lastval|for\s+(update|share))\b",
+    re.IGNORECASE,
+)
+
 
 class ConnectionError(Exception):
     pass
@@ -26,7 +78,9 @@ class QueryError(Exception):
 
 
 class DatabaseConfig(BaseModel):
-    type: str
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+    type: DatabaseType
     description: str
 
     # Option 1: Use connection string directly
@@ -45,13 +99,21 @@ class DatabaseConfig(BaseModel):
 
     extra_params: Dict[str, str] | None = None
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def reject_unsupported_type(cls, data: Any, handler):
+        try:
+            return handler(data)
+        except ValidationError as e:
+            for error in e.errors():
+                if error["loc"] == ("type",) and error["type"] == "literal_error":
+                    raise ConfigurationError(
+                        f"Unsupported database type: {error['input']}"
+                    ) from e
+            raise
+
     @model_validator(mode="after")
     def validate_config(self):
-        # Validate supported database types
-        supported_types = {"postgresql", "mysql", "sqlserver", "snowflake", "sqlite"}
-        if self.type not in supported_types:
-            raise ConfigurationError(f"Unsupported database type: {self.type}")
-
         # If using connection string, no further validation needed
         if self.connection_string:
             return self
@@ -63,33 +125,72 @@ class DatabaseConfig(BaseModel):
         if self.type == "sqlite":
             return self
 
-        if not all([self.host, self.database, self.username]):
+        if not (self.host and self.database and self.username):
             raise ConfigurationError(
                 "Either connection_string or host/database/username must be provided"
             )
 
         return self
 
-    @property
+    @classmethod
+    def trusted(cls, **data) -> "DatabaseConfig":
+        """Build a config from already-validated data without re-running validation"""
+        return cls.model_construct(**data)
+
+    @cached_property
     def dialect(self) -> str:
-        dialect_map = {
-            "postgresql": "postgresql+asyncpg",
-            "mysql": "mysql+aiomysql",
-            "sqlserver": "mssql+pyodbc",
-            "snowflake": "snowflake",
-            "sqlite": "sqlite+aiosqlite",
-        }
-        return dialect_map[self.type]
+        dialect = _DIALECT_MAP.get(self.type)
+        if dialect is None:
+            raise ConfigurationError(f"Unsupported database type: {self.type}")
+        return dialect
+
+    @cached_property
+    def async_connection_string(self) -> str | None:
+        """The connection string with sync driver prefixes swapped for async ones"""
+        conn_str = self.connection_string
+        if conn_str is None:
+            return None
+        for sync_prefix, async_prefix in _ASYNC_PREFIX_MAP:
+            if conn_str.startswith(sync_prefix):
+                return async_prefix + conn_str.removeprefix(sync_prefix)
+        return conn_str
+
+    @cached_property
+    def resolved_query_params(self) -> Dict[str, str]:
+        query_params = dict(self.extra_params or {})
+        # Special handling for Snowflake account parameter
+        if self.type == "snowflake" and self.account:
+            query_params["account"] = self.account
+        return query_params
+
+    @cached_property
+    def base_url(self) -> URL:
+        """The URL built from individual fields, with the configured password if any"""
+        return URL.create(
+            drivername=self.dialect,
+            username=self.username,
+            password=self.password,
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            query=self.resolved_query_params,
+        )
 
 
 class AppConfig(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     databases: Dict[str, DatabaseConfig]
     settings: Dict[str, Any]
 
     @model_validator(mode="after")
     def validate_config(self):
+        db_names = list(self.databases.keys())
+        if len({db_name.lower() for db_name in db_names}) == len(db_names):
+            return self
+
         seen_names = set()
-        for db_name in self.databases.keys():
+        for db_name in db_names:
             name_lower = db_name.lower()
             if name_lower in seen_names:
                 raise ConfigurationError(f"{db_name} is defined twice!")
@@ -104,19 +205,157 @@ class DatabaseManager:
     ):
         self.config = config
         self.password_provider = password_provider or PassPasswordProvider()
-        self.engines: Dict[str, AsyncEngine | Engine] = {}
+        self.engines: OrderedDict[str, tuple[AsyncEngine | Engine, bool]] = (
+            OrderedDict()
+        )
+        self.max_engines = self.config.settings.get("max_engines", 8)
+        self._pending_disposals: set[asyncio.Task] = set()
+        self._url_cache: Dict[str, URL | str] = {}
+        self._password_cache: Dict[str, str | None] = {}
+        self._connect_failures: Dict[str, tuple[int, float]] = {}
+        self._schema_cache: OrderedDict[_SchemaCacheKey, tuple[float, List[tuple]]] = (
+            OrderedDict()
+        )
+        self._schema_inflight: Dict[_SchemaCacheKey, asyncio.Task] = {}
+        self._schema_generations: Dict[str, int] = {}
+        self._result_cache: OrderedDict[
+            _ResultCacheKey, tuple[float, tuple[List[str], List[Row]]]
+        ] = OrderedDict()
+        self._sync_executor = ThreadPoolExecutor(
+            max_workers=self.config.settings.get("sync_query_workers", 16),
+            thread_name_prefix="sql-sync",
+        )
+        self._warm_sqlite_engines()
+
+    def _warm_sqlite_engines(self):
+        """Create SQLite engines up front; they need no password or network"""
+        sqlite_labels = [
+            label
+            for label, db_config in self.config.databases.items()
+            if db_config.type == "sqlite"
+        ]
+        limit = self.max_engines
+        for label in sqlite_labels[:limit]:
+            self._get_engine_entry(label)
+
+    def _password_store_key(self, label: str, db_config: DatabaseConfig) -> str | None:
+        if db_config.connection_string or db_config.type == "sqlite":
+            return None
+        if db_config.password or not db_config.username:
+            return None
+        return db_config.password_store_key or f"databases/{label}"
+
+    def _required_password_store_keys(self) -> List[str]:
+        keys = []
+        for label, db_config in self.config.databases.items():
+            pass_key = self._password_store_key(label, db_config)
+            if pass_key:
+                keys.append(pass_key)
+        return keys
+
+    def _get_password(self, pass_key: str) -> str | None:
+        if pass_key not in self._password_cache:
+            self._password_cache[pass_key] = self.password_provider.get_password(
+                pass_key
+            )
+        return self._password_cache[pass_key]
+
+    async def warmup_passwords(self, labels: List[str] | None = None):
+        """Fetch the passwords of the given databases (default: all) concurrently"""
+        if labels is None:
+            labels = self.list_database_names()
+        pass_keys = set()
+        for label in labels:
+            db_config = self.config.databases.get(label)
+            if not db_config:
+                raise DatabaseNotFoundError(
+                    f"Database config entry for {label} not found"
+                )
+            pass_key = self._password_store_key(label, db_config)
+            if pass_key and pass_key not in self._password_cache:
+                pass_keys.add(pass_key)
+
+        await asyncio.gather(
+            *(asyncio.to_thread(self._get_password, key) for key in pass_keys)
+        )
+
+    async def prefetch_passwords(self):
+        """Let the password provider fetch every password the config needs, off the
+        event loop; failed lookups are retried when their engine is built"""
+        try:
+            await asyncio.to_thread(
+                self.password_provider.prefetch, self._required_password_store_keys()
+            )
+        except Exception:
+            pass
+
+    async def prewarm_pools(self, labels: List[str] | None = None):
+        """Open prewarm_connections connections per network database at once and
+        return them to the pool, so the first requests skip connect and auth"""
+        count = self.config.settings.get("prewarm_connections", 0)
+        if count <= 0:
+            return
+        if labels is None:
+            labels = self.list_database_names()
+        await asyncio.gather(*(self._prewarm_pool(label, count) for label in labels))
+
+    async def _prewarm_pool(self, db_label: str, count: int):
+        try:
+            engine, is_async = self._get_engine_entry(db_label)
+        except Exception:
+            return
+        if engine.dialect.name == "sqlite":
+            return
+
+        if is_async:
+            conns = await asyncio.gather(
+                *(engine.connect() for _ in range(count)), return_exceptions=True
+            )
+            await asyncio.gather(
+                *(conn.close() for conn in conns if not isinstance(conn, BaseException))
+            )
+            return
+
+        def _prewarm_sync():
+            conns = []
+            try:
+                for _ in range(count):
+                    conns.append(engine.connect())
+            except Exception:
+                pass
+            finally:
+                for conn in conns:
+                    conn.close()
+
+        await asyncio.get_running_loop().run_in_executor(
+            self._sync_executor, _prewarm_sync
+        )
+
+    def invalidate_password_cache(self, pass_key: str | None = None):
+        """Forget cached passwords (one key or all) and the URLs and engines built from them"""
+        if pass_key is None:
+            self._password_cache.clear()
+        else:
+            self._password_cache.pop(pass_key, None)
+        self.password_provider.clear_cache(pass_key)
+
+        for label, db_config in self.config.databases.items():
+            label_key = self._password_store_key(label, db_config)
+            if label_key is None or pass_key not in (None, label_key):
+                continue
+            self._url_cache.pop(label, None)
+            entry = self.engines.pop(label, None)
+            if entry is not None:
+                self._dispose_engine(*entry)
 
     def get_connection_url(self, label: str, db_config: DatabaseConfig):
+        if label not in self._url_cache:
+            self._url_cache[label] = self._build_connection_url(label, db_config)
+        return self._url_cache[label]
+
+    def _build_connection_url(self, label: str, db_config: DatabaseConfig):
         if db_config.connection_string:
-            # Convert sync connection strings to async ones
-            conn_str = db_config.connection_string
-            if conn_str.startswith("sqlite://"):
-                conn_str = conn_str.replace("sqlite://", "sqlite+aiosqlite://", 1)
-            elif conn_str.startswith("postgresql://"):
-                conn_str = conn_str.replace("postgresql://", "postgresql+asyncpg://", 1)
-            elif conn_str.startswith("mysql://"):
-                conn_str = conn_str.replace("mysql://", "mysql+aiomysql://", 1)
-            return conn_str
+            return db_config.async_connection_string
 
         if db_config.type == "sqlite":
             if db_config.database == ":memory:":
@@ -124,30 +363,22 @@ class DatabaseManager:
             else:
                 return f"{db_config.dialect}:///{db_config.database}"
 
-        password = db_config.password
-        if not password and db_config.username:
-            pass_key = db_config.password_store_key or f"databases/{label}"
-            password = self.password_provider.get_password(pass_key)
-
-        # Special handling for Snowflake account parameter
-        query_params = db_config.extra_params.copy() if db_config.extra_params else {}
-        if db_config.type == "snowflake" and db_config.account:
-            query_params["account"] = db_config.account
-
-        url = URL.create(
-            drivername=db_config.dialect,
-            username=db_config.username,
-            password=password,
-            host=db_config.host,
-            port=db_config.port,
-            database=db_config.database,
-            query=query_params,
-        )
+        url = db_config.base_url
+        pass_key = self._password_store_key(label, db_config)
+        if pass_key:
+            url = url.set(password=self._get_password(pass_key))
 
         return url
 
     def get_engine(self, db_label: str) -> AsyncEngine | Engine:
-        if db_label not in self.engines:
+        engine, _ = self._get_engine_entry(db_label)
+        return engine
+
+    def _get_engine_entry(self, db_label: str) -> tuple[AsyncEngine | Engine, bool]:
+        """Return the cached engine for a database along with whether it is async"""
+        if db_label in self.engines:
+            self.engines.move_to_end(db_label)
+        else:
             db_config = self.config.databases.get(db_label)
             if not db_config:
                 raise DatabaseNotFoundError(
@@ -157,20 +388,56 @@ class DatabaseManager:
             engine_kwargs = {"echo": False}
             url = self.get_connection_url(db_label, db_config)
 
-            # Only add pool_timeout for non-SQLite databases
-            if not str(url).startswith("sqlite"):
+            if db_config.type == "sqlite":
+                # In-memory databases vanish with their last connection, so keep a single one
+                if _is_sqlite_memory_url(url):
+                    engine_kwargs["poolclass"] = StaticPool
+            else:
                 engine_kwargs["pool_timeout"] = self.config.settings.get(
                     "max_query_timeout", 30
                 )
+                engine_kwargs["pool_use_lifo"] = True
+                engine_kwargs["pool_pre_ping"] = True
+                for pool_setting in ("pool_size", "max_overflow"):
+                    if pool_setting in self.config.settings:
+                        engine_kwargs[pool_setting] = self.config.settings[pool_setting]
 
             # Snowflake doesn't have native async support, use sync engine with async wrapper
-            if db_config.type == "snowflake":
-                engine = create_engine(url, **engine_kwargs)
-            else:
-                engine = create_async_engine(url, **engine_kwargs)
-            self.engines[db_label] = engine
+            is_async = db_config.type != "snowflake"
+            engine = _make_engine(is_async, url, **engine_kwargs)
+            if db_config.type == "sqlite":
+                _register_sqlite_pragmas(engine)
+
+            # Disposing an in-memory SQLite engine would destroy its database
+            evictable = [
+                label
+                for label, (cached, _) in self.engines.items()
+                if not _holds_database(cached)
+            ]
+            while len(self.engines) >= self.max_engines and evictable:
+                self._dispose_engine(*self.engines.pop(evictable.pop(0)))
+            self.engines[db_label] = (engine, is_async)
+
+        return self.engines[db_label]
+
+    def _dispose_engine(self, engine: AsyncEngine | Engine, is_async: bool):
+        """Close the pooled connections of an engine evicted from the cache"""
+        if not is_async:
+            self._sync_executor.submit(engine.dispose)
+            return
 
-        return self.engines.get(db_label)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(engine.dispose())
+            except Exception:
+                engine.sync_engine.dispose(close=False)
+            return
+
+        task = loop.create_task(engine.dispose())
+        self._pending_disposals.add(task)
+        task.add_done_callback(self._pending_disposals.discard)
 
     def list_database_names(self) -> List[str]:
         return list(self.config.databases.keys())
@@ -183,22 +450,45 @@ class DatabaseManager:
         engine = self.get_engine(db_label)
         return engine.dialect.name.lower()
 
+    def quote_identifier(self, db_label: str, name: str) -> str:
+        """Quote an identifier where the database's dialect requires it"""
+        engine = self.get_engine(db_label)
+        return engine.dialect.identifier_preparer.quote(name)
+
+    def _check_connect_circuit(self, db_label: str):
+        """Fail fast while a database keeps refusing connections"""
+        failures, last_failure = self._connect_failures.get(db_label, (0, 0.0))
+        threshold = self.config.settings.get("connect_failure_threshold", 3)
+        cooldown = self.config.settings.get("connect_failure_cooldown", 30)
+        if failures >= threshold and time.monotonic() - last_failure < cooldown:
+            raise ConnectionError(
+                f"Failed to connect to database '{db_label}': "
+                f"giving up for {cooldown}s after {failures} consecutive failures"
+            )
+
+    def _record_connect_failure(self, db_label: str):
+        failures, _ = self._connect_failures.get(db_label, (0, 0.0))
+        self._connect_failures[db_label] = (failures + 1, time.monotonic())
+
     @asynccontextmanager
     async def connect(self, db_label: str):
         """Async connection context manager for async engines"""
-        engine = self.get_engine(db_label)
+        engine, is_async = self._get_engine_entry(db_label)
 
-        if not isinstance(engine, AsyncEngine):
+        if not is_async:
             raise ValueError(
                 f"Cannot use async connect with sync engine for {db_label}"
             )
 
+        self._check_connect_circuit(db_label)
         try:
             conn = await engine.connect()
         except Exception as e:
+            self._record_connect_failure(db_label)
             raise ConnectionError(
                 f"Failed to connect to database '{db_label}': {str(e)}"
             ) from e
+        self._connect_failures.pop(db_label, None)
 
         try:
             yield conn
@@ -208,51 +498,322 @@ class DatabaseManager:
     @contextmanager
     def connect_sync(self, db_label: str):
         """Sync connection context manager for sync engines"""
-        engine = self.get_engine(db_label)
+        engine, is_async = self._get_engine_entry(db_label)
 
-        if isinstance(engine, AsyncEngine):
+        if is_async:
             raise ValueError(
                 f"Cannot use sync connect with async engine for {db_label}"
             )
 
+        self._check_connect_circuit(db_label)
         try:
             conn = engine.connect()
         except Exception as e:
+            self._record_connect_failure(db_label)
             raise ConnectionError(
                 f"Failed to connect to database '{db_label}': {str(e)}"
             ) from e
+        self._connect_failures.pop(db_label, None)
 
         try:
             yield conn
         finally:
             conn.close()
 
-    async def execute_query(self, db_label: str, query: str):
+    async def execute_query(
+        self,
+        db_label: str,
+        query: str | TextClause,
+        params: Dict[str, Any] | None = None,
+    ):
         """Execute a query handling both sync and async connections"""
-        engine = self.get_engine(db_label)
+        _, is_async = self._get_engine_entry(db_label)
 
-        if isinstance(engine, AsyncEngine):
+        if is_async:
             async with self.connect(db_label) as conn:
                 try:
-                    result = await conn.execute(text(query))
+                    result = await conn.execute(_as_clause(query), params)
                     return result
                 except Exception as e:
                     raise QueryError(f"Error executing query: {str(e)}") from e
         else:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
 
             def _execute_sync():
                 with self.connect_sync(db_label) as conn:
                     try:
-                        return conn.execute(text(query))
+                        return conn.execute(_as_clause(query), params)
                     except Exception as e:
                         raise QueryError(f"Error executing query: {str(e)}") from e
 
-            result = await loop.run_in_executor(None, _execute_sync)
+            result = await loop.run_in_executor(self._sync_executor, _execute_sync)
             return result
 
+    async def fetch_rows(
+        self,
+        db_label: str,
+        query: str | TextClause,
+        max_rows: int,
+        params: Dict[str, Any] | None = None,
+    ) -> tuple[List[str], List[Row]]:
+        """Execute a query and read at most max_rows rows through a server-side
+        cursor, so the rest of the result is never transferred"""
+        _, is_async = self._get_engine_entry(db_label)
+
+        if is_async:
+            async with self.connect(db_label) as conn:
+                try:
+                    result = await conn.stream(_as_clause(query), params)
+                    rows = await result.fetchmany(max_rows)
+                    columns = list(result.keys())
+                    await result.close()
+                    return columns, rows
+                except Exception as e:
+                    raise QueryError(f"Error executing query: {str(e)}") from e
+        else:
+            loop = asyncio.get_running_loop()
+
+            def _fetch_sync():
+                with self.connect_sync(db_label) as conn:
+                    try:
+                        result = conn.execution_options(
+                            stream_results=True, max_row_buffer=max_rows
+                        ).execute(_as_clause(query), params)
+                        rows = result.fetchmany(max_rows)
+                        columns = list(result.keys())
+                        result.close()
+                        return columns, rows
+                    except Exception as e:
+                        raise QueryError(f"Error executing query: {str(e)}") from e
+
+            return await loop.run_in_executor(self._sync_executor, _fetch_sync)
+
+    async def fetch_rows_cached(
+        self, db_label: str, query: str, max_rows: int
+    ) -> tuple[List[str], List[Row]]:
+        """Like fetch_rows, but reuse plain read results for query_cache_ttl seconds
+
+        Any other statement drops the database's cached results.
+        """
+        ttl = self.config.settings.get("query_cache_ttl", 0)
+        if ttl <= 0:
+            return await self.fetch_rows(db_label, query, max_rows)
+        if not _is_cacheable_query(query):
+            try:
+                return await self.fetch_rows(db_label, query, max_rows)
+            finally:
+                self.clear_result_cache(db_label)
+
+        key = (db_label, query.strip().rstrip(";").rstrip(), max_rows)
+        cached = self._result_cache.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            self._result_cache.move_to_end(key)
+            return cached[1]
+
+        result = await self.fetch_rows(db_label, query, max_rows)
+        self._result_cache[key] = (time.monotonic() + ttl, result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.config.settings.get(
+            "query_cache_size", 256
+        ):
+            self._result_cache.popitem(last=False)
+        return result
+
+    def clear_result_cache(self, db_label: str | None = None):
+        """Forget cached query results for one database or all of them"""
+        if db_label is None:
+            self._result_cache.clear()
+            return
+        for key in [key for key in self._result_cache if key[0] == db_label]:
+            del self._result_cache[key]
+
+    async def execute_schema_query(
+        self,
+        db_label: str,
+        query: str | TextClause,
+        params: Dict[str, Any] | None = None,
+    ) -> List[tuple]:
+        """Execute a catalog query, reusing its rows for schema_cache_ttl seconds
+
+        Concurrent callers asking for the same query share one round trip.
+        """
+        ttl = self.config.settings.get("schema_cache_ttl", 0)
+        key = (db_label, query, tuple(sorted((params or {}).items())))
+        if ttl > 0:
+            cached = self._schema_cache.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                self._schema_cache.move_to_end(key)
+                return cached[1]
+
+        fetch = self._schema_inflight.get(key)
+        if fetch is None:
+            generation = self._schema_generations.get(db_label, 0)
+            fetch = asyncio.create_task(
+                self._load_schema_rows(key, params, ttl, generation)
+            )
+            self._schema_inflight[key] = fetch
+            fetch.add_done_callback(lambda done: self._forget_schema_fetch(key, done))
+        return await asyncio.shield(fetch)
+
+    async def _load_schema_rows(
+        self,
+        key: _SchemaCacheKey,
+        params: Dict[str, Any] | None,
+        ttl: float,
+        generation: int,
+    ) -> List[tuple]:
+        rows = await self._fetch_schema_rows(key[0], key[1], params)
+        if ttl > 0 and self._schema_generations.get(key[0], 0) == generation:
+            expires = time.monotonic() + ttl * random.uniform(0.95, 1.05)
+            self._schema_cache[key] = (expires, rows)
+            self._schema_cache.move_to_end(key)
+            while len(self._schema_cache) > self.config.settings.get(
+                "schema_cache_size", 256
+            ):
+                self._schema_cache.popitem(last=False)
+        return rows
+
+    async def _fetch_schema_rows(
+        self, db_label: str, query: str | TextClause, params: Dict[str, Any] | None
+    ) -> List[tuple]:
+        result = await self.execute_query(db_label, query, params)
+        return [tuple(row) for row in result.fetchall()]
+
+    def _forget_schema_fetch(self, key: _SchemaCacheKey, fetch: asyncio.Task):
+        if self._schema_inflight.get(key) is fetch:
+            del self._schema_inflight[key]
+
+    def clear_schema_cache(self, db_label: str | None = None):
+        """Forget cached catalog query results for one database or all of them"""
+        labels = self.list_database_names() if db_label is None else [db_label]
+        for label in labels:
+            self._schema_generations[label] = self._schema_generations.get(label, 0) + 1
+        for cache in (self._schema_cache, self._schema_inflight):
+            for key in [key for key in cache if key[0] in labels]:
+                del cache[key]
+
+    async def dispose(self):
+        """Close every cached engine's connections and forget the engines"""
+        while self.engines:
+            _, (engine, is_async) = self.engines.popitem(last=False)
+            if is_async:
+                await engine.dispose()
+            else:
+                await asyncio.to_thread(engine.dispose)
+        self._schema_cache.clear()
+        if self._pending_disposals:
+            await asyncio.gather(*self._pending_disposals)
+
+    def __del__(self):
+        executor = getattr(self, "_sync_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _is_cacheable_query(query: str) -> bool:
+    start = _LEADING_COMMENTS.match(query).end()
+    body = query[start:]
+    return bool(_READ_QUERY.match(body)) and not _SIDE_EFFECTS.search(body)
+
+
+def _as_clause(query: str | TextClause) -> TextClause:
+    return text(query) if isinstance(query, str) else query
+
+
+def _is_sqlite_memory_url(url: URL | str) -> bool:
+    url = make_url(url)
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def _holds_database(engine: AsyncEngine | Engine) -> bool:
+    return isinstance(getattr(engine, "sync_engine", engine).pool, StaticPool)
+
+
+def _register_sqlite_pragmas(engine: AsyncEngine | Engine):
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def _make_engine(
+    is_async: bool, url: URL | str, **engine_kwargs
+) -> AsyncEngine | Engine:
+    if is_async:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        return create_async_engine(url, **engine_kwargs)
+
+    from sqlalchemy import create_engine
+
+    return create_engine(url, **engine_kwargs)
+
+
+@functools.cache
+def _config_code_digest() -> bytes:
+    with open(__file__, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _config_cache_file(cache_dir: str, raw_config: bytes) -> str:
+    key = hashlib.sha256(_config_code_digest() + raw_config).hexdigest()
+    return os.path.join(cache_dir, f"{key}.pkl")
+
+
+def _read_cached_config(cache_file: str) -> AppConfig | None:
+    try:
+        with open(cache_file, "rb") as f:
+            cached = pickle.load(f)
+
+        databases = {
+            name: DatabaseConfig.trusted(**db_data)
+            for name, db_data in cached["databases"].items()
+        }
+        return AppConfig.model_construct(
+            databases=databases, settings=dict(cached["settings"])
+        )
+    except Exception:
+        return None
+
+
+def _write_cached_config(cache_file: str, config: AppConfig):
+    os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "wb") as f:
+        pickle.dump(config.model_dump(), f)
+    os.replace(tmp_file, cache_file)
+
+
+def load_config(config_path: str, cache_dir: str | None = None) -> AppConfig:
+    real_path = os.path.realpath(config_path)
+    stat = os.stat(real_path)
+    config = _load_config_cached(real_path, stat.st_mtime_ns, stat.st_size, cache_dir)
+    return config.model_copy(deep=True)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config_cached(
+    real_path: str, mtime_ns: int, size: int, cache_dir: str | None
+) -> AppConfig:
+    with open(real_path, "rb") as f:
+        raw_config = f.read()
+
+    cache_file = _config_cache_file(cache_dir, raw_config) if cache_dir else None
+    if cache_file:
+        cached = _read_cached_config(cache_file)
+        if cached is not None:
+            return cached
+
+    config = AppConfig.model_validate(yaml.load(raw_config, Loader=_YAML_LOADER))
+
+    if cache_file:
+        try:
+            _write_cached_config(cache_file, config)
+        except OSError:
+            pass
 
-def load_config(config_path: str) -> AppConfig:
-    with open(config_path, "r") as f:
-        config_data = yaml.safe_load(f)
-    return AppConfig(**config_data)
+    return config
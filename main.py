@@ -6,6 +6,7 @@ table sampling, and structure inspection.
 
 import sys
 import os
+from contextlib import asynccontextmanager
 from typing import List, Dict
 from fastmcp import FastMCP
 from fastmcp.tools.tool import ToolResult
@@ -18,7 +19,15 @@ from tools.describe_table import TableDescription
 from tools.list_tables import TablesResponse
 from tools.test_connection import ConnectionTestResponse
 
-mcp = FastMCP("Database Explorer")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    await db_manager.prefetch_passwords()
+    await db_manager.prewarm_pools()
+    yield
+
+
+mcp = FastMCP("Database Explorer", lifespan=lifespan)
 
 # Check for config file argument
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -26,7 +35,11 @@ config_path = os.path.join(script_dir, "config.yaml")
 if len(sys.argv) > 2 and sys.argv[1] == "--config":
     config_path = sys.argv[2]
 
-config = load_config(config_path)
+config_cache_dir = None
+if os.environ.get("SQL_MCP_CONFIG_CACHE"):
+    config_cache_dir = os.path.expanduser("~/.cache/sql-mcp-server")
+
+config = load_config(config_path, config_cache_dir)
 db_manager = DatabaseManager(config)
 
 
@@ -1,4 +1,5 @@
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from abc import ABC, abstractmethod
 
 
@@ -10,11 +11,46 @@ class PasswordProvider(ABC):
         """Get password for database connection using pass key. Returns None if not found."""
         pass
 
+    def prefetch(self, pass_keys: list[str]):
+        """Warm up any provider-side cache for the given pass keys"""
+        pass
+
+    def clear_cache(self, pass_key: str | None = None):
+        """Forget provider-side cached passwords (one key or all)"""
+        pass
+
 
 class PassPasswordProvider(PasswordProvider):
     """Password provider using Unix 'pass' password manager"""
 
+    def __init__(self):
+        self._cache: dict[str, str | None] = {}
+
     def get_password(self, pass_key: str) -> str | None:
+        if pass_key not in self._cache:
+            self._cache[pass_key] = self._lookup(pass_key)
+        return self._cache[pass_key]
+
+    def prefetch(self, pass_keys: list[str]):
+        if not pass_keys:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(pass_keys))) as executor:
+            futures = [executor.submit(self.get_password, key) for key in pass_keys]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except (ValueError, OSError, subprocess.SubprocessError):
+                    pass
+
+    def clear_cache(self, pass_key: str | None = None):
+        """Forget previously retrieved passwords, e.g. after a rotation"""
+        if pass_key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(pass_key, None)
+
+    def _lookup(self, pass_key: str) -> str | None:
         result = subprocess.run(["pass", pass_key], capture_output=True, text=True)
 
         if result.returncode == 1:
@@ -0,0 +1,58 @@
+import os
+import sqlite3
+import sys
+import pytest
+
+from database_manager import load_config, DatabaseManager, DatabaseConfig
+
+TESTS_DIR = os.path.dirname(__file__)
+CHINOOK_PATH = os.path.join(TESTS_DIR, "Chinook_Sqlite.sqlite")
+TEST_CONFIG_PATH = os.path.join(TESTS_DIR, "test_config.yaml")
+
+
+if sys.platform != "win32":
+    import uvloop
+
+    def pytest_asyncio_loop_factories(config, item):
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def chinook_memory_uri():
+    """Copy of the Chinook database held in a shared-cache in-memory SQLite database"""
+    uri = f"file:chinook_{os.getpid()}?mode=memory&cache=shared"
+    # The in-memory database only lives as long as at least one connection to it is open
+    keeper = sqlite3.connect(uri, uri=True)
+    source = sqlite3.connect(CHINOOK_PATH)
+    source.backup(keeper)
+    source.close()
+
+    yield uri
+
+    keeper.close()
+
+
+@pytest.fixture(scope="session")
+def app_config(request):
+    """The parsed test config; copy it before mutating"""
+    # Reuse load_config's on-disk cache across sessions unless -p no:cacheprovider
+    cache = getattr(request.config, "cache", None)
+    cache_dir = str(cache.mkdir("sql-mcp-config")) if cache else None
+    return load_config(TEST_CONFIG_PATH, cache_dir=cache_dir)
+
+
+@pytest.fixture(scope="session")
+async def db_manager(app_config, chinook_memory_uri):
+    """Session-wide database manager for tests using the shared test config"""
+    config = app_config.model_copy(deep=True)
+    chinook_config = config.databases["chinook_sqlite"]
+    config.databases["chinook_sqlite"] = DatabaseConfig(
+        type="sqlite",
+        description=chinook_config.description,
+        connection_string=f"sqlite:///{chinook_memory_uri}&uri=true",
+    )
+    manager = DatabaseManager(config)
+
+    yield manager
+
+    await manager.dispose()
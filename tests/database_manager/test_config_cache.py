@@ -0,0 +1,76 @@
+import os
+import pickle
+
+from database_manager import load_config, AppConfig, _config_cache_file
+
+
+def test_load_config_writes_and_reuses_cache(tmp_path):
+    """Test that a cached config is written on first load and reused afterwards"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "databases:\n"
+        "  cache_db:\n"
+        "    type: sqlite\n"
+        "    database: ':memory:'\n"
+        "    description: Cached DB\n"
+        "settings:\n"
+        "  sample_size: 5\n"
+    )
+    cache_dir = tmp_path / "cache"
+
+    config = load_config(str(config_path), str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached_config = load_config(str(config_path), str(cache_dir))
+    assert isinstance(cached_config, AppConfig)
+    assert cached_config.model_dump() == config.model_dump()
+    assert cached_config.databases["cache_db"].dialect == "sqlite+aiosqlite"
+
+
+def test_load_config_cache_invalidated_on_change(tmp_path):
+    """Test that changing the config file contents bypasses the stale cache entry"""
+    config_path = tmp_path / "config.yaml"
+    template = (
+        "databases:\n"
+        "  cache_db:\n"
+        "    type: sqlite\n"
+        "    database: ':memory:'\n"
+        "    description: {description}\n"
+        "settings: {{}}\n"
+    )
+    cache_dir = tmp_path / "cache"
+
+    config_path.write_text(template.format(description="First"))
+    load_config(str(config_path), str(cache_dir))
+
+    config_path.write_text(template.format(description="Second"))
+    config = load_config(str(config_path), str(cache_dir))
+
+    assert config.databases["cache_db"].description == "Second"
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_load_config_returns_independent_copies(tmp_path):
+    """Test that memoized configs can be mutated without affecting later loads"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("databases: {}\nsettings:\n  max_rows_per_query: 500\n")
+
+    config = load_config(str(config_path))
+    config.settings["max_rows_per_query"] = 3
+
+    assert load_config(str(config_path)).settings["max_rows_per_query"] == 500
+
+
+def test_load_config_reparses_malformed_cache_entry(tmp_path):
+    """Test that a cache file of the wrong shape is ignored instead of crashing"""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("databases: {}\nsettings:\n  sample_size: 7\n")
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    cache_file = _config_cache_file(str(cache_dir), config_path.read_bytes())
+    with open(cache_file, "wb") as f:
+        pickle.dump(["stale"], f)
+
+    config = load_config(str(config_path), str(cache_dir))
+
+    assert config.settings == {"sample_size": 7}
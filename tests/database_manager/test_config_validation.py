@@ -45,3 +45,10 @@ def test_duplicate_database_names():
             },
             settings={},
         )
+
+
+def test_unsupported_database_type_on_trusted_config():
+    """Test that configs built without validation still reject unknown types"""
+    config = DatabaseConfig.trusted(type="wiggle", description="Test DB")
+    with raises(ConfigurationError, match="Unsupported database type: wiggle"):
+        config.dialect
@@ -1,20 +1,13 @@
-import os
 import pytest
 
 from database_manager import (
-    load_config,
-    DatabaseManager,
+    AppConfig,
     ConnectionError,
+    DatabaseConfig,
+    DatabaseManager,
     DatabaseNotFoundError,
 )
-
-
-@pytest.fixture
-def db_manager():
-    """Fixture to provide database manager for tests"""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "test_config.yaml")
-    config = load_config(config_path)
-    return DatabaseManager(config)
+from password_provider import NoOpPasswordProvider
 
 
 async def test_connection_error_unreachable_database(db_manager):
@@ -53,3 +46,60 @@ async def test_connection_context_manager_cleanup_on_exception(db_manager):
             raise RuntimeError("Test exception")
 
     assert conn_ref.closed
+
+
+async def test_connect_fails_fast_after_repeated_failures():
+    """Test that connect() stops dialing a database after consecutive failures"""
+    config = AppConfig(
+        databases={
+            "refusing_db": DatabaseConfig(
+                type="postgresql",
+                description="Refusing DB",
+                host="127.0.0.1",
+                port=1,
+                database="db",
+                username="user",
+                password="pass",
+            )
+        },
+        settings={"connect_failure_threshold": 2, "connect_failure_cooldown": 60},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError, match="refusing_db"):
+            async with manager.connect("refusing_db"):
+                pass
+
+    with pytest.raises(ConnectionError, match="after 2 consecutive failures"):
+        async with manager.connect("refusing_db"):
+            pass
+
+
+async def test_prewarm_pools_tolerates_unreachable_databases():
+    """Test that prewarming is best effort and leaves failures to real requests"""
+    config = AppConfig(
+        databases={
+            "refusing_db": DatabaseConfig(
+                type="postgresql",
+                description="Refusing DB",
+                host="127.0.0.1",
+                port=1,
+                database="db",
+                username="user",
+                password="pass",
+            ),
+            "mem": DatabaseConfig(
+                type="sqlite", description="mem", database=":memory:"
+            ),
+        },
+        settings={"prewarm_connections": 2},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    await manager.prewarm_pools()
+
+    with pytest.raises(ConnectionError, match="refusing_db"):
+        async with manager.connect("refusing_db"):
+            pass
+    await manager.dispose()
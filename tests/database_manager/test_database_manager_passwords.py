@@ -1,5 +1,11 @@
+import pytest
+
 from database_manager import DatabaseManager, DatabaseConfig, AppConfig
-from password_provider import StaticPasswordProvider, NoOpPasswordProvider
+from password_provider import (
+    PasswordProvider,
+    StaticPasswordProvider,
+    NoOpPasswordProvider,
+)
 
 
 def test_database_manager_with_pass_provider():
@@ -186,3 +192,165 @@ def test_database_manager_mixed_password_store_keys():
         "databases/default_db": 1,
         "company/production/database": 1,
     }
+
+
+async def test_database_manager_prefetches_required_password_keys():
+    """Test DatabaseManager asks the provider to prefetch only keys it will need"""
+    prefetched = []
+
+    class RecordingPasswordProvider(StaticPasswordProvider):
+        def prefetch(self, pass_keys: list[str]):
+            prefetched.extend(pass_keys)
+
+    config = AppConfig(
+        databases={
+            "default_db": DatabaseConfig(
+                type="postgresql",
+                description="DB using default pass key",
+                host="localhost",
+                database="defaultdb",
+                username="default_user",
+            ),
+            "custom_db": DatabaseConfig(
+                type="mysql",
+                description="DB using custom pass key",
+                host="localhost",
+                database="customdb",
+                username="custom_user",
+                password_store_key="company/production/database",
+            ),
+            "plaintext_db": DatabaseConfig(
+                type="postgresql",
+                description="DB with plaintext password",
+                host="localhost",
+                database="plaindb",
+                username="plain_user",
+                password="plaintext_password",
+            ),
+            "sqlite_db": DatabaseConfig(
+                type="sqlite",
+                description="SQLite DB",
+                database=":memory:",
+            ),
+        },
+        settings={},
+    )
+
+    db_manager = DatabaseManager(config, RecordingPasswordProvider({}))
+    assert prefetched == []
+
+    await db_manager.prefetch_passwords()
+    assert prefetched == ["databases/default_db", "company/production/database"]
+
+
+async def test_database_manager_builds_when_password_store_fails():
+    """Test that a failing password store only fails once the database is used"""
+
+    class FailingPasswordProvider(PasswordProvider):
+        def prefetch(self, pass_keys: list[str]):
+            raise FileNotFoundError(2, "No such file or directory", "pass")
+
+        def get_password(self, pass_key: str) -> str | None:
+            raise FileNotFoundError(2, "No such file or directory", "pass")
+
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="postgresql",
+                description="Test DB",
+                host="localhost",
+                database="mydb",
+                username="user",
+            )
+        },
+        settings={},
+    )
+
+    db_manager = DatabaseManager(config, FailingPasswordProvider())
+    await db_manager.prefetch_passwords()
+
+    with pytest.raises(FileNotFoundError):
+        db_manager.get_engine("test_db")
+
+
+def test_database_manager_memoizes_password_lookups():
+    """Test that each pass key is fetched once until the cache is invalidated"""
+    calls = []
+
+    class RotatingPasswordProvider(StaticPasswordProvider):
+        def get_password(self, pass_key: str) -> str | None:
+            calls.append(pass_key)
+            return super().get_password(pass_key)
+
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="postgresql",
+                description="Test DB",
+                host="localhost",
+                database="mydb",
+                username="user",
+            )
+        },
+        settings={},
+    )
+    password_provider = RotatingPasswordProvider({"databases/test_db": "old"})
+    manager = DatabaseManager(config, password_provider)
+    db_config = manager.get_database_config("test_db")
+
+    manager.get_engine("test_db")
+    manager._url_cache.clear()
+    assert manager.get_connection_url("test_db", db_config).password == "old"
+    assert calls == ["databases/test_db"]
+
+    password_provider.passwords["databases/test_db"] = "new"
+    manager.invalidate_password_cache("databases/test_db")
+
+    assert "test_db" not in manager.engines
+    assert manager.get_connection_url("test_db", db_config).password == "new"
+    assert calls == ["databases/test_db", "databases/test_db"]
+
+
+async def test_database_manager_warmup_passwords():
+    """Test that warming up fetches each pass key once and engines reuse the result"""
+    calls = []
+
+    class TrackingPasswordProvider(StaticPasswordProvider):
+        def get_password(self, pass_key: str) -> str | None:
+            calls.append(pass_key)
+            return super().get_password(pass_key)
+
+    config = AppConfig(
+        databases={
+            label: DatabaseConfig(
+                type="postgresql",
+                description=f"{label} DB",
+                host="localhost",
+                database=label,
+                username="user",
+            )
+            for label in ["first_db", "second_db"]
+        }
+        | {
+            "local_db": DatabaseConfig(
+                type="sqlite", description="Local DB", database=":memory:"
+            )
+        },
+        settings={},
+    )
+    manager = DatabaseManager(
+        config,
+        TrackingPasswordProvider(
+            {"databases/first_db": "one", "databases/second_db": "two"}
+        ),
+    )
+
+    await manager.warmup_passwords()
+    assert sorted(calls) == ["databases/first_db", "databases/second_db"]
+
+    assert (
+        manager.get_connection_url("second_db", config.databases["second_db"]).password
+        == "two"
+    )
+    await manager.warmup_passwords(["first_db"])
+    assert len(calls) == 2
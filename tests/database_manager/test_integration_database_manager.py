@@ -1,30 +1,38 @@
+import asyncio
 from sqlalchemy import text
+from sqlalchemy.pool import StaticPool
 from database_manager import DatabaseManager, DatabaseConfig, AppConfig
 from password_provider import StaticPasswordProvider, NoOpPasswordProvider
 
 
 async def test_database_manager_lazy_engine_creation():
-    """Test that DatabaseManager creates engines lazily"""
+    """Test that DatabaseManager creates network engines lazily and SQLite eagerly"""
     config = AppConfig(
         databases={
             "test_db": DatabaseConfig(
                 type="sqlite",
                 description="Test DB",
                 database=":memory:",
-            )
+            ),
+            "remote_db": DatabaseConfig(
+                type="postgresql",
+                description="Remote DB",
+                host="remote.example.com",
+                database="remote",
+                username="remote_user",
+                password="secret",
+            ),
         },
         settings={},
     )
 
     manager = DatabaseManager(config, NoOpPasswordProvider())
 
-    # No engines should be created initially
-    assert len(manager.engines) == 0
+    # Only the SQLite engine is created up front
+    assert list(manager.engines) == ["test_db"]
 
-    # Engine should be created on first access
     engine = manager.get_engine("test_db")
     assert engine is not None
-    assert len(manager.engines) == 1
 
     async with engine.connect() as conn:
         await conn.execute(text("SELECT 1"))
@@ -33,6 +41,10 @@ async def test_database_manager_lazy_engine_creation():
     engine2 = manager.get_engine("test_db")
     assert engine is engine2
 
+    # Network engine is created on first access
+    assert manager.get_engine("remote_db") is not None
+    assert list(manager.engines) == ["test_db", "remote_db"]
+
 
 def test_database_manager_complete_integration():
     """Integration test with complete AppConfig and multiple databases"""
@@ -89,35 +101,35 @@ def test_database_manager_complete_integration():
 
     manager = DatabaseManager(config, password_provider)
 
-    # Initially no engines created and no password calls
-    assert len(manager.engines) == 0
+    # Only the SQLite cache_db is pre-warmed and no password calls were made
+    assert list(manager.engines) == ["cache_db"]
     assert len(call_count) == 0
 
     # List database names without creating engines
     db_names = manager.list_database_names()
     assert set(db_names) == {"prod_db", "dev_db", "cache_db", "legacy_db"}
-    assert len(manager.engines) == 0  # Still no engines created
+    assert list(manager.engines) == ["cache_db"]  # No new engines created
 
     # Get engine for prod_db - should call password provider once
     prod_engine = manager.get_engine("prod_db")
     assert prod_engine is not None
-    assert len(manager.engines) == 1
+    assert len(manager.engines) == 2
     assert call_count.get("databases/prod_db") == 1
 
     # Get same engine again - should NOT call password provider again
     prod_engine2 = manager.get_engine("prod_db")
     assert prod_engine is prod_engine2
-    assert len(manager.engines) == 1
+    assert len(manager.engines) == 2
     assert call_count.get("databases/prod_db") == 1  # No additional call
 
     # Get engine for dev_db - should call password provider once for dev
     dev_engine = manager.get_engine("dev_db")
     assert dev_engine is not None
-    assert len(manager.engines) == 2
+    assert len(manager.engines) == 3
     assert call_count.get("databases/dev_db") == 1
     assert call_count.get("databases/prod_db") == 1  # Unchanged
 
-    # Get engine for SQLite cache_db - should not call password provider
+    # SQLite cache_db was pre-warmed - should not call password provider
     cache_engine = manager.get_engine("cache_db")
     assert cache_engine is not None
     assert len(manager.engines) == 3
@@ -134,3 +146,280 @@ def test_database_manager_complete_integration():
         "databases/prod_db": 1,
         "databases/dev_db": 1,
     }
+
+
+async def test_database_manager_evicts_least_recently_used_engine(tmp_path):
+    """Test that DatabaseManager keeps at most max_engines engines cached"""
+    config = AppConfig(
+        databases={
+            name: DatabaseConfig(
+                type="sqlite",
+                description=f"{name} DB",
+                database=str(tmp_path / f"{name}.sqlite"),
+            )
+            for name in ["first_db", "second_db", "third_db"]
+        },
+        settings={"max_engines": 2},
+    )
+
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    first_engine = manager.get_engine("first_db")
+    manager.get_engine("second_db")
+    assert manager.get_engine("first_db") is first_engine
+
+    manager.get_engine("third_db")
+
+    assert list(manager.engines) == ["first_db", "third_db"]
+
+
+async def test_database_manager_never_evicts_memory_sqlite_engines():
+    """Test that eviction keeps in-memory SQLite databases and their data alive"""
+    config = AppConfig(
+        databases={
+            name: DatabaseConfig(
+                type="sqlite",
+                description=f"{name} DB",
+                database=":memory:",
+            )
+            for name in ["first_db", "second_db", "third_db"]
+        },
+        settings={"max_engines": 2},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    await manager.execute_query("first_db", "CREATE TABLE kept (id INTEGER)")
+    manager.get_engine("second_db")
+    manager.get_engine("third_db")
+
+    assert list(manager.engines) == ["first_db", "second_db", "third_db"]
+    result = await manager.execute_query("first_db", "SELECT COUNT(*) FROM kept")
+    assert result.scalar() == 0
+
+
+async def test_database_manager_shares_one_connection_for_memory_sqlite():
+    """Test that in-memory SQLite engines, however they are configured, keep one connection"""
+    config = AppConfig(
+        databases={
+            "field_db": DatabaseConfig(
+                type="sqlite", description="Field DB", database=":memory:"
+            ),
+            "url_db": DatabaseConfig(
+                type="sqlite", description="URL DB", connection_string="sqlite://"
+            ),
+        },
+        settings={},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    for label in ["field_db", "url_db"]:
+        assert isinstance(manager.get_engine(label).sync_engine.pool, StaticPool)
+        await manager.execute_query(label, "CREATE TABLE t (id INTEGER)")
+        result = await manager.execute_query(label, "SELECT COUNT(*) FROM t")
+        assert result.scalar() == 0
+
+
+def test_database_manager_applies_pool_settings_to_network_engines():
+    """Test that pool_size and max_overflow settings size network engine pools"""
+    config = AppConfig(
+        databases={
+            "pg_db": DatabaseConfig(
+                type="postgresql",
+                description="PG DB",
+                host="localhost",
+                database="pg",
+                username="user",
+                password="pass",
+            )
+        },
+        settings={"pool_size": 2, "max_overflow": 8},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    pool = manager.get_engine("pg_db").sync_engine.pool
+    assert pool.size() == 2
+    assert pool._max_overflow == 8
+
+
+async def test_database_manager_tunes_sqlite_connections():
+    """Test that SQLite connections are opened with the tuning pragmas applied"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    cache_size = await manager.execute_query("test_db", "PRAGMA cache_size")
+    assert cache_size.scalar() == -20000
+    temp_store = await manager.execute_query("test_db", "PRAGMA temp_store")
+    assert temp_store.scalar() == 2
+
+
+async def test_database_manager_dispose_closes_all_engines():
+    """Test that dispose() empties the engine cache and engines are rebuilt on demand"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+    engine = manager.get_engine("test_db")
+
+    await manager.dispose()
+
+    assert len(manager.engines) == 0
+    assert manager.get_engine("test_db") is not engine
+
+
+class GatedDatabaseManager(DatabaseManager):
+    """Counts catalog fetches and holds each one until release is set"""
+
+    def __init__(self, config: AppConfig):
+        super().__init__(config, NoOpPasswordProvider())
+        self.fetches = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def _fetch_schema_rows(self, db_label, query, params):
+        self.fetches += 1
+        self.started.set()
+        await self.release.wait()
+        return await super()._fetch_schema_rows(db_label, query, params)
+
+
+async def test_database_manager_shares_concurrent_schema_queries():
+    """Test that concurrent identical catalog queries hit the database once"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={},
+    )
+    manager = GatedDatabaseManager(config)
+
+    queries = [
+        asyncio.create_task(manager.execute_schema_query("test_db", "SELECT 1"))
+        for _ in range(5)
+    ]
+    await manager.started.wait()
+    manager.release.set()
+
+    assert await asyncio.gather(*queries) == [[(1,)]] * 5
+    assert manager.fetches == 1
+    await manager.dispose()
+
+
+async def test_database_manager_bounds_schema_cache():
+    """Test that schema_cache_size evicts the least recently used catalog results"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={"schema_cache_ttl": 60, "schema_cache_size": 2},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    for query in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"]:
+        await manager.execute_schema_query("test_db", query)
+
+    assert [key[1] for key in manager._schema_cache] == ["SELECT 1", "SELECT 3"]
+    await manager.dispose()
+
+
+async def test_database_manager_clear_discards_in_flight_schema_rows():
+    """Test that rows fetched across a cache clear are not written back"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={"schema_cache_ttl": 60},
+    )
+    manager = GatedDatabaseManager(config)
+
+    fetch = asyncio.create_task(manager.execute_schema_query("test_db", "SELECT 1"))
+    await manager.started.wait()
+    manager.clear_schema_cache("test_db")
+    manager.release.set()
+    assert await fetch == [(1,)]
+
+    assert await manager.execute_schema_query("test_db", "SELECT 1") == [(1,)]
+    assert manager.fetches == 2
+    await manager.execute_schema_query("test_db", "SELECT 1")
+    assert manager.fetches == 2
+    await manager.dispose()
+
+
+async def test_database_manager_fetch_rows_stops_at_max_rows():
+    """Test that fetch_rows returns the column names and only the first max_rows rows"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+    query = """
+        WITH RECURSIVE numbers(n) AS (
+            SELECT 1 UNION ALL SELECT n + 1 FROM numbers WHERE n < 100000
+        )
+        SELECT n FROM numbers
+    """
+
+    columns, rows = await manager.fetch_rows("test_db", query, 5)
+
+    assert columns == ["n"]
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+    await manager.dispose()
+
+
+class RecordingDatabaseManager(DatabaseManager):
+    """Records the queries that reach the database and answers each with one row"""
+
+    def __init__(self, config: AppConfig):
+        super().__init__(config, NoOpPasswordProvider())
+        self.fetched = []
+
+    async def fetch_rows(self, db_label, query, max_rows, params=None):
+        self.fetched.append(query)
+        return ["n"], [(1,)]
+
+
+async def test_database_manager_never_caches_side_effects():
+    """Test that reads with side effects run every time even with query_cache_ttl set"""
+    config = AppConfig(
+        databases={
+            "test_db": DatabaseConfig(
+                type="sqlite", description="Test DB", database=":memory:"
+            )
+        },
+        settings={"query_cache_ttl": 60},
+    )
+    manager = RecordingDatabaseManager(config)
+
+    for query in [
+        "SELECT * INTO archive FROM orders",
+        "SELECT nextval('order_ids')",
+        "SELECT * FROM orders FOR UPDATE",
+        "WITH gone AS (DELETE FROM orders RETURNING *) SELECT * FROM gone",
+        "EXPLAIN ANALYZE DELETE FROM orders",
+    ]:
+        manager.fetched.clear()
+        await manager.fetch_rows_cached("test_db", query, 10)
+        await manager.fetch_rows_cached("test_db", query, 10)
+        assert manager.fetched == [query, query]
+    await manager.dispose()
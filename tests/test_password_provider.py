@@ -1,56 +1,95 @@
+import subprocess
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock
 
 from password_provider import PassPasswordProvider
 
 
-def test_pass_password_provider_success():
-    """Test successful password retrieval from pass"""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "secret_password\n"
+@pytest.fixture
+def mock_run(monkeypatch):
+    """subprocess.run replaced by a mock whose pass call succeeds by default"""
+    run = MagicMock()
+    run.return_value.returncode = 0
+    run.return_value.stdout = "secret_password\n"
+    monkeypatch.setattr(subprocess, "run", run)
+    return run
+
 
-        provider = PassPasswordProvider()
-        password = provider.get_password("test_db")
-        assert password == "secret_password"
-        mock_run.assert_called_once_with(
-            ["pass", "test_db"], capture_output=True, text=True
-        )
+def test_pass_password_provider_success(mock_run):
+    """Test successful password retrieval from pass"""
+    provider = PassPasswordProvider()
+    password = provider.get_password("test_db")
+    assert password == "secret_password"
+    mock_run.assert_called_once_with(
+        ["pass", "test_db"], capture_output=True, text=True
+    )
 
 
-def test_pass_password_provider_custom_prefix():
+def test_pass_password_provider_custom_prefix(mock_run):
     """Test pass provider with custom prefix"""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "secret_password\n"
-
-        provider = PassPasswordProvider()
-        password = provider.get_password("test_db")
-        assert password == "secret_password"
-        mock_run.assert_called_once_with(
-            ["pass", "test_db"], capture_output=True, text=True
-        )
+    provider = PassPasswordProvider()
+    password = provider.get_password("test_db")
+    assert password == "secret_password"
+    mock_run.assert_called_once_with(
+        ["pass", "test_db"], capture_output=True, text=True
+    )
 
 
-def test_pass_password_provider_not_found():
+def test_pass_password_provider_not_found(mock_run):
     """Test pass command when entry not found (exit code 1)"""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value.returncode = 1
-        mock_run.return_value.stdout = ""
+    mock_run.return_value.returncode = 1
+    mock_run.return_value.stdout = ""
 
-        provider = PassPasswordProvider()
-        password = provider.get_password("test_db")
-        assert password is None
+    provider = PassPasswordProvider()
+    password = provider.get_password("test_db")
+    assert password is None
 
 
-def test_pass_password_provider_failure():
+def test_pass_password_provider_failure(mock_run):
     """Test pass command failure (exit code > 1)"""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value.returncode = 2
-        mock_run.return_value.stdout = ""
-
-        provider = PassPasswordProvider()
-        with pytest.raises(
-            ValueError, match="Failed to get password from pass: test_db"
-        ):
-            provider.get_password("test_db")
+    mock_run.return_value.returncode = 2
+    mock_run.return_value.stdout = ""
+
+    provider = PassPasswordProvider()
+    with pytest.raises(ValueError, match="Failed to get password from pass: test_db"):
+        provider.get_password("test_db")
+
+
+def test_pass_password_provider_caches_lookups(mock_run):
+    """Test that repeated lookups for the same key only invoke pass once"""
+    provider = PassPasswordProvider()
+    assert provider.get_password("test_db") == "secret_password"
+    assert provider.get_password("test_db") == "secret_password"
+    mock_run.assert_called_once()
+
+    provider.clear_cache()
+    assert provider.get_password("test_db") == "secret_password"
+    assert mock_run.call_count == 2
+
+
+def test_pass_password_provider_clears_a_single_key(mock_run):
+    """Test that clearing one key keeps the other cached passwords"""
+    provider = PassPasswordProvider()
+    provider.get_password("databases/first")
+    provider.get_password("databases/second")
+
+    provider.clear_cache("databases/first")
+    provider.get_password("databases/first")
+    provider.get_password("databases/second")
+
+    assert [call.args[0][1] for call in mock_run.call_args_list] == [
+        "databases/first",
+        "databases/second",
+        "databases/first",
+    ]
+
+
+def test_pass_password_provider_prefetch_populates_cache(mock_run):
+    """Test that prefetched keys are served from the cache afterwards"""
+    provider = PassPasswordProvider()
+    provider.prefetch(["databases/first", "databases/second"])
+    assert mock_run.call_count == 2
+
+    assert provider.get_password("databases/first") == "secret_password"
+    assert provider.get_password("databases/second") == "secret_password"
+    assert mock_run.call_count == 2
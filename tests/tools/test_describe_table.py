@@ -1,24 +1,20 @@
-import os
+import asyncio
+import importlib
+
 import pytest
 
-from database_manager import (
-    load_config,
-    DatabaseManager,
-)
+from database_manager import AppConfig, DatabaseConfig, DatabaseManager
+from password_provider import NoOpPasswordProvider
 from tools.describe_table import (
+    DIALECT_QUERIES,
     describe_table,
     TableDescription,
     TableNotFoundError,
+    _get_counts,
+    _get_sqlite_foreign_key_index,
 )
 
 
-@pytest.fixture
-def db_manager():
-    config_path = os.path.join(os.path.dirname(__file__), "../test_config.yaml")
-    config = load_config(config_path)
-    return DatabaseManager(config)
-
-
 async def test_describe_table_album_structure(db_manager):
     """Test that describe_table correctly describes Album table structure"""
     result = await describe_table(db_manager, "chinook_sqlite", "Album")
@@ -28,12 +24,9 @@ async def test_describe_table_album_structure(db_manager):
 
     assert len(result.columns) == 3
 
-    column_names = [col.name for col in result.columns]
-    expected_columns = ["AlbumId", "Title", "ArtistId"]
-    for expected_col in expected_columns:
-        assert expected_col in column_names
+    assert set(result.columns_by_name) == {"AlbumId", "Title", "ArtistId"}
 
-    album_id_col = next(col for col in result.columns if col.name == "AlbumId")
+    album_id_col = result.columns_by_name["AlbumId"]
     assert album_id_col.primary_key is True
     assert album_id_col.nullable is False
 
@@ -53,10 +46,9 @@ async def test_describe_table_artist_incoming_fks(db_manager):
 
     assert len(result.incoming_foreign_keys) >= 1
 
-    album_fk = next(
-        (fk for fk in result.incoming_foreign_keys if fk.from_table == "Album"), None
-    )
-    assert album_fk is not None
+    incoming_by_table = {fk.from_table: fk for fk in result.incoming_foreign_keys}
+    assert "Album" in incoming_by_table
+    album_fk = incoming_by_table["Album"]
     assert album_fk.from_columns == ["ArtistId"]
     assert album_fk.to_columns == ["ArtistId"]
 
@@ -70,31 +62,58 @@ async def test_describe_table_customer_multiple_incoming_fks(db_manager):
 
     assert len(result.incoming_foreign_keys) >= 1
 
-    invoice_fk = next(
-        (fk for fk in result.incoming_foreign_keys if fk.from_table == "Invoice"), None
-    )
-    assert invoice_fk is not None
+    incoming_by_table = {fk.from_table: fk for fk in result.incoming_foreign_keys}
+    assert "Invoice" in incoming_by_table
+    invoice_fk = incoming_by_table["Invoice"]
     assert invoice_fk.from_columns == ["CustomerId"]
     assert invoice_fk.to_columns == ["CustomerId"]
 
 
+async def test_describe_multiple_tables_concurrently(db_manager):
+    """Test that concurrent describe_table calls each return their own table"""
+    tables = ["Album", "Artist", "Customer", "Track"]
+    results = await asyncio.gather(
+        *(describe_table(db_manager, "chinook_sqlite", t) for t in tables)
+    )
+
+    assert [r.table for r in results] == tables
+    for result in results:
+        assert result.columns
+        assert any(col.primary_key for col in result.columns)
+        assert result.total_count == (
+            len(result.columns)
+            + len(result.foreign_keys)
+            + len(result.incoming_foreign_keys)
+        )
+
+    track = results[3]
+    assert {fk.referred_table for fk in track.foreign_keys} == {
+        "Album",
+        "Genre",
+        "MediaType",
+    }
+
+
 async def test_describe_table_nonexistent_table(db_manager):
     """Test that describe_table handles non-existent table gracefully"""
     with pytest.raises(TableNotFoundError):
         await describe_table(db_manager, "chinook_sqlite", "NonexistentTable")
 
 
+async def test_describe_table_binds_table_name_as_a_value(db_manager):
+    """Test that quotes in the table name cannot alter the catalog queries"""
+    with pytest.raises(TableNotFoundError):
+        await describe_table(db_manager, "chinook_sqlite", "x' OR name LIKE '%")
+
+
 async def test_describe_table_column_types_and_nullability(db_manager):
     """Test that describe_table correctly reports column types and nullability"""
     result = await describe_table(db_manager, "chinook_sqlite", "Track")
 
     assert isinstance(result, TableDescription)
 
-    track_id_col = next((col for col in result.columns if col.name == "TrackId"), None)
-    name_col = next((col for col in result.columns if col.name == "Name"), None)
-
-    assert track_id_col is not None
-    assert name_col is not None
+    track_id_col = result.columns_by_name["TrackId"]
+    name_col = result.columns_by_name["Name"]
 
     assert track_id_col.primary_key is True
     assert track_id_col.nullable is False
@@ -104,6 +123,16 @@ async def test_describe_table_column_types_and_nullability(db_manager):
     assert isinstance(name_col.type, str)
 
 
+async def test_describe_table_marks_every_composite_primary_key_column(db_manager):
+    """Test that each column of a composite primary key is flagged"""
+    result = await describe_table(db_manager, "chinook_sqlite", "PlaylistTrack")
+
+    assert [col.name for col in result.columns if col.primary_key] == [
+        "PlaylistId",
+        "TrackId",
+    ]
+
+
 async def test_describe_table_pagination_fields(db_manager):
     """Test that describe_table returns pagination fields correctly"""
     result = await describe_table(
@@ -117,6 +146,25 @@ async def test_describe_table_pagination_fields(db_manager):
     assert len(result.columns) <= 5
 
 
+async def test_describe_table_first_page_of_small_table_skips_counts(
+    db_manager, monkeypatch
+):
+    """Test that a table fitting on page 1 is counted from the fetched rows"""
+
+    async def fail_counts(*args, **kwargs):
+        raise AssertionError("count query should not run")
+
+    # tools/__init__ re-exports describe_table over the submodule's name
+    module = importlib.import_module("tools.describe_table")
+    monkeypatch.setattr(module, "_get_counts", fail_counts)
+
+    result = await describe_table(db_manager, "chinook_sqlite", "Artist")
+
+    assert [col.name for col in result.columns] == ["ArtistId", "Name"]
+    assert result.total_count == 3
+    assert result.total_pages == 1
+
+
 async def test_describe_table_pagination_limit_validation(db_manager):
     """Test that describe_table validates pagination parameters"""
     from tools.describe_table import DescribeTableError
@@ -153,3 +201,70 @@ async def test_describe_table_pagination_second_page(db_manager):
     # Pages should be different
     if result_page1.total_count > 3:
         assert page1_items != page2_items
+
+
+async def test_describe_table_pages_concatenate_to_full_description(db_manager):
+    """Test that small pages spanning columns and foreign keys add up to one full page"""
+    full = await describe_table(db_manager, "chinook_sqlite", "Track", limit=100)
+
+    columns, foreign_keys, incoming = [], [], []
+    for page in range(1, full.total_count // 4 + 2):
+        result = await describe_table(
+            db_manager, "chinook_sqlite", "Track", limit=4, page=page
+        )
+        assert sum(
+            map(
+                len, (result.columns, result.foreign_keys, result.incoming_foreign_keys)
+            )
+        ) == min(4, max(0, full.total_count - (page - 1) * 4))
+        columns += result.columns
+        foreign_keys += result.foreign_keys
+        incoming += result.incoming_foreign_keys
+
+    assert columns == full.columns
+    assert foreign_keys == full.foreign_keys
+    assert incoming == full.incoming_foreign_keys
+
+
+async def test_describe_table_sees_foreign_keys_added_after_first_describe():
+    """Test that the cached SQLite foreign key index is rebuilt on schema change"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={},
+    )
+    manager = DatabaseManager(config, NoOpPasswordProvider())
+    await manager.execute_query("mem", "CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+    await manager.execute_query(
+        "mem", "CREATE TABLE child (id INTEGER, parent_id REFERENCES parent(id))"
+    )
+
+    first = await describe_table(manager, "mem", "parent")
+    assert [fk.from_table for fk in first.incoming_foreign_keys] == ["child"]
+
+    await manager.execute_query(
+        "mem", "CREATE TABLE other (id INTEGER, parent_id REFERENCES parent(id))"
+    )
+
+    second = await describe_table(manager, "mem", "parent")
+    assert sorted(fk.from_table for fk in second.incoming_foreign_keys) == [
+        "child",
+        "other",
+    ]
+    assert second.total_count == 3
+
+
+async def test_combined_count_query_matches_foreign_key_index(db_manager):
+    """Test that the single-row count query agrees with the SQLite foreign key index"""
+    queries = DIALECT_QUERIES["sqlite"]
+    fk_index = await _get_sqlite_foreign_key_index(
+        db_manager, "chinook_sqlite", queries
+    )
+
+    for table in ("Album", "Artist", "Track"):
+        combined = await _get_counts(db_manager, "chinook_sqlite", table, "", queries)
+        indexed = await _get_counts(
+            db_manager, "chinook_sqlite", table, "", queries, fk_index
+        )
+        assert combined == indexed
@@ -1,22 +1,10 @@
-import os
 import pytest
 
-from database_manager import (
-    load_config,
-    DatabaseManager,
-    QueryError,
-)
+from database_manager import AppConfig, DatabaseConfig, DatabaseManager, QueryError
+from password_provider import NoOpPasswordProvider
 from tools.execute_query import execute_query, QueryResponse
 
 
-@pytest.fixture
-async def db_manager():
-    """Fixture to provide database manager for tests"""
-    config_path = os.path.join(os.path.dirname(__file__), "../test_config.yaml")
-    config = load_config(config_path)
-    return DatabaseManager(config)
-
-
 async def test_execute_query_simple_select(db_manager):
     """Test that execute_query works with a simple SELECT query"""
     query = "SELECT AlbumId, Title FROM Album LIMIT 3"
@@ -64,7 +52,7 @@ async def test_execute_query_aggregate_functions(db_manager):
     assert len(result.columns) == 1
     assert "total_albums" in result.columns
     assert result.row_count == 1
-    assert result.rows[0]["total_albums"] > 0
+    assert result.rows[0][0] > 0
 
 
 async def test_execute_query_truncation_behavior(db_manager):
@@ -84,6 +72,72 @@ async def test_execute_query_truncation_behavior(db_manager):
         assert not result.truncated
 
 
+async def test_execute_query_truncated_only_when_rows_exceed_limit():
+    """Test that a result of exactly max_rows_per_query rows is not reported as truncated"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"max_rows_per_query": 2},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    exact = await execute_query(db_manager, "mem", "SELECT 1 AS n UNION ALL SELECT 2")
+    assert exact.row_count == 2
+    assert not exact.truncated
+
+    over = await execute_query(
+        db_manager, "mem", "SELECT 1 AS n UNION ALL SELECT 2 UNION ALL SELECT 3"
+    )
+    assert over.rows == [[1], [2]]
+    assert over.truncated
+
+
+async def test_execute_query_reuses_cached_results_until_a_write():
+    """Test that query_cache_ttl caches read results until another statement runs"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"query_cache_ttl": 60},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+    query = "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"
+
+    result = await execute_query(db_manager, "mem", query)
+    assert result.rows == []
+
+    await db_manager.execute_query("mem", "CREATE TABLE first (id INTEGER)")
+    result = await execute_query(db_manager, "mem", query + ";")
+    assert result.rows == []
+
+    with pytest.raises(QueryError):
+        await execute_query(db_manager, "mem", "CREATE TABLE second (id INTEGER)")
+
+    result = await execute_query(db_manager, "mem", query)
+    assert result.rows == [["first"], ["second"]]
+
+
+async def test_execute_query_caches_reads_behind_leading_comments():
+    """Test that a read starting with comments is cached rather than clearing the cache"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"query_cache_ttl": 60},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+    query = "SELECT name FROM sqlite_master WHERE type = 'table'"
+
+    result = await execute_query(db_manager, "mem", query)
+    assert result.rows == []
+
+    await db_manager.execute_query("mem", "CREATE TABLE added (id INTEGER)")
+    await execute_query(db_manager, "mem", "-- tables\n/* all */ " + query)
+    result = await execute_query(db_manager, "mem", query)
+    assert result.rows == []
+
+
 async def test_execute_query_empty_result_set(db_manager):
     """Test that execute_query handles queries that return no rows"""
     query = "SELECT * FROM Album WHERE AlbumId = -1"
@@ -111,7 +165,7 @@ async def test_execute_query_data_types(db_manager):
     assert isinstance(result, QueryResponse)
     assert result.row_count == 1
 
-    row = result.rows[0]
+    row = dict(zip(result.columns, result.rows[0]))
     assert isinstance(row["EmployeeId"], int)
     assert isinstance(row["FirstName"], str)
     # BirthDate and ReportsTo can be None or have values
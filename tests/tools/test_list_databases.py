@@ -1,9 +1,7 @@
-import os
 import sys
-import pytest
 from pathlib import Path
 
-from database_manager import load_config, DatabaseManager
+from database_manager import DatabaseManager
 from tools.list_databases import list_databases
 
 # Add the project root to Python path so we can import modules
@@ -11,14 +9,6 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-@pytest.fixture
-def db_manager():
-    """Fixture to provide database manager for tests"""
-    config_path = os.path.join(os.path.dirname(__file__), "../test_config.yaml")
-    config = load_config(config_path)
-    return DatabaseManager(config)
-
-
 def test_list_databases_returns_all_configured_databases(db_manager):
     """Test that list_databases returns all databases from config"""
     result = list_databases(db_manager)
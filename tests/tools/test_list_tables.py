@@ -1,18 +1,11 @@
-import os
 import pytest
 
-from database_manager import load_config, DatabaseManager
+from database_manager import AppConfig, DatabaseConfig, DatabaseManager, QueryError
+from password_provider import NoOpPasswordProvider
+from tools.execute_query import execute_query
 from tools.list_tables import list_tables, TablesResponse, ListTablesError
 
 
-@pytest.fixture
-def db_manager():
-    """Fixture to provide database manager for tests"""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "test_config.yaml")
-    config = load_config(config_path)
-    return DatabaseManager(config)
-
-
 async def test_list_tables_result_structure(db_manager):
     """Test that list_tables returns correct structure for successful calls"""
     result = await list_tables(db_manager, "chinook_sqlite", limit=10, page=1)
@@ -31,11 +24,9 @@ async def test_list_tables_chinook_database(db_manager):
     assert isinstance(result, TablesResponse)
     assert len(result.schemas) > 0
 
-    all_tables = []
-    for schema in result.schemas:
-        all_tables.extend(schema.tables)
+    all_tables = {table for schema in result.schemas for table in schema.tables}
 
-    expected_tables = [
+    expected_tables = {
         "Album",
         "Artist",
         "Customer",
@@ -47,12 +38,12 @@ async def test_list_tables_chinook_database(db_manager):
         "Playlist",
         "PlaylistTrack",
         "Track",
-    ]
+    }
 
-    for table in expected_tables:
-        assert (
-            table in all_tables
-        ), f"Expected table '{table}' not found in Chinook database"
+    missing = expected_tables - all_tables
+    assert (
+        not missing
+    ), f"Expected tables {sorted(missing)} not found in Chinook database"
 
 
 async def test_list_tables_empty_memory_database(db_manager):
@@ -125,10 +116,9 @@ async def test_list_tables_invalid_limit(db_manager):
         await list_tables(db_manager, "chinook_sqlite", limit=-1, page=1)
 
 
-async def test_list_tables_limit_clamping():
+async def test_list_tables_limit_clamping(app_config):
     """Test that limit is clamped to max_rows_per_query"""
-    config_path = os.path.join(os.path.dirname(__file__), "..", "test_config.yaml")
-    config = load_config(config_path)
+    config = app_config.model_copy(deep=True)
 
     # Set very low max_rows_per_query
     config.settings["max_rows_per_query"] = 3
@@ -140,3 +130,77 @@ async def test_list_tables_limit_clamping():
 
     total_tables_returned = len([t for s in result.schemas for t in s.tables])
     assert total_tables_returned == 3
+
+
+async def test_list_tables_page_past_the_end_keeps_total_count(db_manager):
+    """Test that an empty page beyond the last one still reports the total"""
+    result = await list_tables(db_manager, "chinook_sqlite", limit=5, page=10)
+
+    assert result.schemas == []
+    assert result.total_count == 11
+    assert result.total_pages == 3
+
+
+async def test_list_tables_reuses_cached_catalog_rows_until_cleared():
+    """Test that schema_cache_ttl caches table listings until the cache is cleared"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"schema_cache_ttl": 60},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 0
+
+    await db_manager.execute_query("mem", "CREATE TABLE added (id INTEGER)")
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 0
+
+    db_manager.clear_schema_cache("mem")
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 1
+    assert result.schemas[0].tables == ["added"]
+
+
+async def test_list_tables_sees_tables_created_through_execute_query():
+    """Test that DDL run through execute_query invalidates cached table listings"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"schema_cache_ttl": 60},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 0
+
+    with pytest.raises(QueryError):
+        await execute_query(db_manager, "mem", "CREATE TABLE added (id INTEGER)")
+
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.schemas[0].tables == ["added"]
+
+
+async def test_list_tables_sees_tables_created_behind_a_comment():
+    """Test that DDL after a leading comment still invalidates cached table listings"""
+    config = AppConfig(
+        databases={
+            "mem": DatabaseConfig(type="sqlite", description="mem", database=":memory:")
+        },
+        settings={"schema_cache_ttl": 60},
+    )
+    db_manager = DatabaseManager(config, NoOpPasswordProvider())
+
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 0
+
+    with pytest.raises(QueryError):
+        await execute_query(
+            db_manager, "mem", "-- add\n/* table */ CREATE TABLE added (id INTEGER)"
+        )
+
+    result = await list_tables(db_manager, "mem", limit=10, page=1)
+    assert result.total_count == 1
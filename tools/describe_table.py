@@ -1,6 +1,13 @@
-from typing import Any, List
-import math
+from typing import Any, Dict, List, Mapping, NamedTuple
+from types import MappingProxyType
+from collections import defaultdict
+from functools import cached_property
+import asyncio
+import re
+import textwrap
+import weakref
 from pydantic import BaseModel
+from sqlalchemy import TextClause, text
 from database_manager import DatabaseManager
 
 
@@ -16,7 +23,7 @@ class ColumnInfo(BaseModel):
     name: str
     type: str
     nullable: bool
-    default: Any = None
+    default: str | None = None
     primary_key: bool = False
 
 
@@ -41,14 +48,18 @@ class TableDescription(BaseModel):
     current_page: int
     total_pages: int
 
+    @cached_property
+    def columns_by_name(self) -> Dict[str, ColumnInfo]:
+        return {column.name: column for column in self.columns}
+
 
 DIALECT_QUERIES = {
     "postgresql": {
         "table_exists": """
             SELECT table_name FROM information_schema.tables 
-            WHERE table_name = '{table_name}' 
+            WHERE table_name = :table_name 
             AND table_schema NOT IN ('information_schema', 'pg_catalog')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
             LIMIT 1
         """,
         "columns": """
@@ -56,20 +67,33 @@ DIALECT_QUERIES = {
                 c.column_name,
                 c.data_type,
                 c.is_nullable,
-                c.column_default
+                c.column_default,
+                pk.column_name IS NOT NULL as is_primary_key
             FROM information_schema.columns c
+            LEFT JOIN (
+                SELECT kcu.table_schema, kcu.table_name, kcu.column_name
+                FROM information_schema.table_constraints tc
+                JOIN information_schema.key_column_usage kcu
+                    ON kcu.constraint_schema = tc.constraint_schema
+                    AND kcu.constraint_name = tc.constraint_name
+                    AND kcu.table_name = tc.table_name
+                WHERE tc.constraint_type = 'PRIMARY KEY'
+                AND tc.table_name = :table_name
+            ) pk ON pk.table_schema = c.table_schema
+                AND pk.table_name = c.table_name
+                AND pk.column_name = c.column_name
             WHERE c.table_schema NOT IN ('information_schema', 'pg_catalog')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
             ORDER BY c.ordinal_position
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "columns_count": """
             SELECT COUNT(*)
             FROM information_schema.columns c
             WHERE c.table_schema NOT IN ('information_schema', 'pg_catalog')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
         """,
         "foreign_key": """
             SELECT 
@@ -88,12 +112,12 @@ DIALECT_QUERIES = {
             JOIN pg_namespace fn ON ft.relnamespace = fn.oid
             JOIN pg_attribute fa ON fa.attrelid = ft.oid AND fa.attnum = ANY(c.confkey)
             WHERE c.contype = 'f'
-            AND ('{source_table_name}' = '' OR t.relname = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR ft.relname = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR n.nspname = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR fn.nspname = '{dest_schema_name}')
+            AND (:source_table_name = '' OR t.relname = :source_table_name)
+            AND (:dest_table_name = '' OR ft.relname = :dest_table_name)
+            AND (:source_schema_name = '' OR n.nspname = :source_schema_name)
+            AND (:dest_schema_name = '' OR fn.nspname = :dest_schema_name)
             ORDER BY c.conname
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "foreign_key_count": """
             SELECT COUNT(*)
@@ -103,29 +127,18 @@ DIALECT_QUERIES = {
             JOIN pg_class ft ON c.confrelid = ft.oid
             JOIN pg_namespace fn ON ft.relnamespace = fn.oid
             WHERE c.contype = 'f'
-            AND ('{source_table_name}' = '' OR t.relname = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR ft.relname = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR n.nspname = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR fn.nspname = '{dest_schema_name}')
-        """,
-        "primary_key": """
-            SELECT 
-                c.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.columns c ON kcu.column_name = c.column_name AND kcu.table_name = c.table_name
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-            AND tc.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR tc.table_schema = '{schema_name}')
-            ORDER BY kcu.ordinal_position
+            AND (:source_table_name = '' OR t.relname = :source_table_name)
+            AND (:dest_table_name = '' OR ft.relname = :dest_table_name)
+            AND (:source_schema_name = '' OR n.nspname = :source_schema_name)
+            AND (:dest_schema_name = '' OR fn.nspname = :dest_schema_name)
         """,
     },
     "mysql": {
         "table_exists": """
             SELECT table_name FROM information_schema.tables 
-            WHERE table_name = '{table_name}' 
+            WHERE table_name = :table_name 
             AND table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
             LIMIT 1
         """,
         "columns": """
@@ -133,20 +146,21 @@ DIALECT_QUERIES = {
                 c.column_name,
                 c.data_type,
                 c.is_nullable,
-                c.column_default
+                c.column_default,
+                c.column_key = 'PRI' as is_primary_key
             FROM information_schema.columns c
             WHERE c.table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
             ORDER BY c.ordinal_position
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "columns_count": """
             SELECT COUNT(*)
             FROM information_schema.columns c
             WHERE c.table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
         """,
         "foreign_key": """
             SELECT 
@@ -160,38 +174,28 @@ DIALECT_QUERIES = {
             FROM information_schema.key_column_usage kcu
             WHERE kcu.referenced_table_name IS NOT NULL
             AND kcu.table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND ('{source_table_name}' = '' OR kcu.table_name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR kcu.referenced_table_name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR kcu.table_schema = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR kcu.referenced_table_schema = '{dest_schema_name}')
+            AND (:source_table_name = '' OR kcu.table_name = :source_table_name)
+            AND (:dest_table_name = '' OR kcu.referenced_table_name = :dest_table_name)
+            AND (:source_schema_name = '' OR kcu.table_schema = :source_schema_name)
+            AND (:dest_schema_name = '' OR kcu.referenced_table_schema = :dest_schema_name)
             ORDER BY kcu.constraint_name
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "foreign_key_count": """
             SELECT COUNT(*)
             FROM information_schema.key_column_usage kcu
             WHERE kcu.referenced_table_name IS NOT NULL
             AND kcu.table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND ('{source_table_name}' = '' OR kcu.table_name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR kcu.referenced_table_name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR kcu.table_schema = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR kcu.referenced_table_schema = '{dest_schema_name}')
-        """,
-        "primary_key": """
-            SELECT 
-                c.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-            AND tc.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR tc.table_schema = '{schema_name}')
-            ORDER BY kcu.ordinal_position
+            AND (:source_table_name = '' OR kcu.table_name = :source_table_name)
+            AND (:dest_table_name = '' OR kcu.referenced_table_name = :dest_table_name)
+            AND (:source_schema_name = '' OR kcu.table_schema = :source_schema_name)
+            AND (:dest_schema_name = '' OR kcu.referenced_table_schema = :dest_schema_name)
         """,
     },
     "sqlite": {
         "table_exists": """
             SELECT name FROM sqlite_master 
-            WHERE type='table' AND name = '{table_name}' 
+            WHERE type='table' AND name = :table_name 
             LIMIT 1
         """,
         "columns": """
@@ -199,14 +203,15 @@ DIALECT_QUERIES = {
                 p.name as column_name,
                 p.type as data_type,
                 CASE WHEN p."notnull" = 0 THEN 'YES' ELSE 'NO' END as is_nullable,
-                p.dflt_value as column_default
-            FROM pragma_table_info('{table_name}') p
+                p.dflt_value as column_default,
+                p.pk > 0 as is_primary_key
+            FROM pragma_table_info(:table_name) p
             ORDER BY p.cid
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "columns_count": """
             SELECT COUNT(*)
-            FROM pragma_table_info('{table_name}')
+            FROM pragma_table_info(:table_name)
         """,
         "foreign_key": """
             SELECT 
@@ -220,51 +225,54 @@ DIALECT_QUERIES = {
             FROM sqlite_master m
             JOIN pragma_foreign_key_list(m.name) fk
             WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
-            AND ('{source_table_name}' = '' OR m.name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR fk."table" = '{dest_table_name}')
+            AND (:source_table_name = '' OR m.name = :source_table_name)
+            AND (:dest_table_name = '' OR fk."table" = :dest_table_name)
             ORDER BY constraint_name
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "foreign_key_count": """
             SELECT COUNT(*)
             FROM sqlite_master m
             JOIN pragma_foreign_key_list(m.name) fk
             WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
-            AND ('{source_table_name}' = '' OR m.name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR fk."table" = '{dest_table_name}')
-        """,
-        "primary_key": """
-            SELECT 
-                p.name as column_name
-            FROM pragma_table_info('{table_name}') p
-            WHERE p.pk = 1
-            ORDER BY p.pk
+            AND (:source_table_name = '' OR m.name = :source_table_name)
+            AND (:dest_table_name = '' OR fk."table" = :dest_table_name)
         """,
     },
     "mssql": {
         "table_exists": """
             SELECT t.name FROM sys.tables t
             INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
-            WHERE t.name = '{table_name}' 
+            WHERE t.name = :table_name 
             AND s.name NOT IN ('information_schema', 'sys')
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
+            AND (:schema_name = '' OR s.name = :schema_name)
         """,
         "columns": """
             SELECT 
                 c.name as column_name,
                 tp.name as data_type,
                 CASE WHEN c.is_nullable = 1 THEN 'YES' ELSE 'NO' END as is_nullable,
-                dc.definition as column_default
+                dc.definition as column_default,
+                CASE WHEN EXISTS (
+                    SELECT 1
+                    FROM sys.key_constraints kc
+                    JOIN sys.index_columns ic
+                        ON kc.parent_object_id = ic.object_id
+                        AND kc.unique_index_id = ic.index_id
+                    WHERE kc.type = 'PK'
+                    AND ic.object_id = c.object_id
+                    AND ic.column_id = c.column_id
+                ) THEN 1 ELSE 0 END as is_primary_key
             FROM sys.tables t
             INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
             INNER JOIN sys.columns c ON t.object_id = c.object_id
             INNER JOIN sys.types tp ON c.user_type_id = tp.user_type_id
             LEFT JOIN sys.default_constraints dc ON c.default_object_id = dc.object_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND t.name = '{table_name}'
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
+            AND t.name = :table_name
+            AND (:schema_name = '' OR s.name = :schema_name)
             ORDER BY c.column_id
-            OFFSET {offset} ROWS FETCH NEXT {limit} ROWS ONLY
+            OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
         """,
         "columns_count": """
             SELECT COUNT(*)
@@ -272,8 +280,8 @@ DIALECT_QUERIES = {
             INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
             INNER JOIN sys.columns c ON t.object_id = c.object_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND t.name = '{table_name}'
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
+            AND t.name = :table_name
+            AND (:schema_name = '' OR s.name = :schema_name)
         """,
         "foreign_key": """
             SELECT 
@@ -293,12 +301,12 @@ DIALECT_QUERIES = {
             JOIN sys.schemas rs ON rt.schema_id = rs.schema_id
             JOIN sys.columns rc ON fkc.referenced_object_id = rc.object_id AND fkc.referenced_column_id = rc.column_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND ('{source_table_name}' = '' OR t.name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR rt.name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR s.name = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR rs.name = '{dest_schema_name}')
+            AND (:source_table_name = '' OR t.name = :source_table_name)
+            AND (:dest_table_name = '' OR rt.name = :dest_table_name)
+            AND (:source_schema_name = '' OR s.name = :source_schema_name)
+            AND (:dest_schema_name = '' OR rs.name = :dest_schema_name)
             ORDER BY fk.name
-            OFFSET {offset} ROWS FETCH NEXT {limit} ROWS ONLY
+            OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
         """,
         "foreign_key_count": """
             SELECT COUNT(*)
@@ -309,31 +317,18 @@ DIALECT_QUERIES = {
             JOIN sys.tables rt ON fk.referenced_object_id = rt.object_id
             JOIN sys.schemas rs ON rt.schema_id = rs.schema_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND ('{source_table_name}' = '' OR t.name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR rt.name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR s.name = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR rs.name = '{dest_schema_name}')
-        """,
-        "primary_key": """
-            SELECT 
-                c.name as column_name
-            FROM sys.key_constraints kc
-            JOIN sys.index_columns ic ON kc.parent_object_id = ic.object_id AND kc.unique_index_id = ic.index_id
-            JOIN sys.columns c ON ic.object_id = c.object_id AND ic.column_id = c.column_id
-            JOIN sys.tables t ON kc.parent_object_id = t.object_id
-            JOIN sys.schemas s ON t.schema_id = s.schema_id
-            WHERE kc.type = 'PK'
-            AND t.name = '{table_name}'
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
-            ORDER BY ic.key_ordinal
+            AND (:source_table_name = '' OR t.name = :source_table_name)
+            AND (:dest_table_name = '' OR rt.name = :dest_table_name)
+            AND (:source_schema_name = '' OR s.name = :source_schema_name)
+            AND (:dest_schema_name = '' OR rs.name = :dest_schema_name)
         """,
     },
     "snowflake": {
         "table_exists": """
             SELECT table_name FROM information_schema.tables 
-            WHERE table_name = '{table_name}' 
+            WHERE table_name = :table_name 
             AND table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
             LIMIT 1
         """,
         "columns": """
@@ -341,87 +336,191 @@ DIALECT_QUERIES = {
                 c.column_name,
                 c.data_type,
                 c.is_nullable,
-                c.column_default
+                c.column_default,
+                pk.column_name IS NOT NULL as is_primary_key
             FROM information_schema.columns c
+            LEFT JOIN (
+                SELECT kcu.table_schema, kcu.table_name, kcu.column_name
+                FROM information_schema.table_constraints tc
+                JOIN information_schema.key_column_usage kcu
+                    ON kcu.constraint_schema = tc.constraint_schema
+                    AND kcu.constraint_name = tc.constraint_name
+                    AND kcu.table_name = tc.table_name
+                WHERE tc.constraint_type = 'PRIMARY KEY'
+                AND tc.table_name = :table_name
+            ) pk ON pk.table_schema = c.table_schema
+                AND pk.table_name = c.table_name
+                AND pk.column_name = c.column_name
             WHERE c.table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
             ORDER BY c.ordinal_position
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "columns_count": """
             SELECT COUNT(*)
             FROM information_schema.columns c
             WHERE c.table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND c.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR c.table_schema = '{schema_name}')
+            AND c.table_name = :table_name
+            AND (:schema_name = '' OR c.table_schema = :schema_name)
         """,
         "foreign_key": """
             SELECT 
-                tc.table_schema as source_schema_name,
-                tc.table_name as source_table_name,
+                kcu.table_schema as source_schema_name,
+                kcu.table_name as source_table_name,
                 kcu.column_name as source_column_name,
-                ccu.table_schema as dest_schema_name,
-                ccu.table_name as dest_table_name,
-                ccu.column_name as dest_column_name,
-                tc.constraint_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage ccu ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-            AND tc.table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND ('{source_table_name}' = '' OR tc.table_name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR ccu.table_name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR tc.table_schema = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR ccu.table_schema = '{dest_schema_name}')
-            ORDER BY tc.constraint_name
-            LIMIT {limit} OFFSET {offset}
+                rkcu.table_schema as dest_schema_name,
+                rkcu.table_name as dest_table_name,
+                rkcu.column_name as dest_column_name,
+                kcu.constraint_name
+            FROM information_schema.referential_constraints rc
+            JOIN information_schema.key_column_usage kcu
+                ON kcu.constraint_catalog = rc.constraint_catalog
+                AND kcu.constraint_schema = rc.constraint_schema
+                AND kcu.constraint_name = rc.constraint_name
+            JOIN information_schema.key_column_usage rkcu
+                ON rkcu.constraint_catalog = rc.unique_constraint_catalog
+                AND rkcu.constraint_schema = rc.unique_constraint_schema
+                AND rkcu.constraint_name = rc.unique_constraint_name
+                AND rkcu.ordinal_position = kcu.position_in_unique_constraint
+            WHERE kcu.table_schema NOT IN ('INFORMATION_SCHEMA')
+            AND (:source_table_name = '' OR kcu.table_name = :source_table_name)
+            AND (:dest_table_name = '' OR rkcu.table_name = :dest_table_name)
+            AND (:source_schema_name = '' OR kcu.table_schema = :source_schema_name)
+            AND (:dest_schema_name = '' OR rkcu.table_schema = :dest_schema_name)
+            ORDER BY kcu.constraint_name, kcu.ordinal_position
+            LIMIT :limit OFFSET :offset
         """,
         "foreign_key_count": """
             SELECT COUNT(*)
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-            JOIN information_schema.constraint_column_usage ccu ON ccu.constraint_name = tc.constraint_name
-            WHERE tc.constraint_type = 'FOREIGN KEY'
-            AND tc.table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND ('{source_table_name}' = '' OR tc.table_name = '{source_table_name}')
-            AND ('{dest_table_name}' = '' OR ccu.table_name = '{dest_table_name}')
-            AND ('{source_schema_name}' = '' OR tc.table_schema = '{source_schema_name}')
-            AND ('{dest_schema_name}' = '' OR ccu.table_schema = '{dest_schema_name}')
-        """,
-        "primary_key": """
-            SELECT 
-                kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-            AND tc.table_name = '{table_name}'
-            AND ('{schema_name}' = '' OR tc.table_schema = '{schema_name}')
-            ORDER BY kcu.ordinal_position
+            FROM information_schema.referential_constraints rc
+            JOIN information_schema.key_column_usage kcu
+                ON kcu.constraint_catalog = rc.constraint_catalog
+                AND kcu.constraint_schema = rc.constraint_schema
+                AND kcu.constraint_name = rc.constraint_name
+            JOIN information_schema.key_column_usage rkcu
+                ON rkcu.constraint_catalog = rc.unique_constraint_catalog
+                AND rkcu.constraint_schema = rc.unique_constraint_schema
+                AND rkcu.constraint_name = rc.unique_constraint_name
+                AND rkcu.ordinal_position = kcu.position_in_unique_constraint
+            WHERE kcu.table_schema NOT IN ('INFORMATION_SCHEMA')
+            AND (:source_table_name = '' OR kcu.table_name = :source_table_name)
+            AND (:dest_table_name = '' OR rkcu.table_name = :dest_table_name)
+            AND (:source_schema_name = '' OR kcu.table_schema = :source_schema_name)
+            AND (:dest_schema_name = '' OR rkcu.table_schema = :dest_schema_name)
         """,
     },
 }
 
+_BIND_PARAM = re.compile(r"(?<![:\w]):(\w+)")
 
-async def _get_primary_keys(
-    db_manager: DatabaseManager,
-    database: str,
-    table_name: str,
-    db_schema: str,
-    dialect: str,
-    queries: dict,
-) -> set:
-    """Get primary key columns for a table"""
+
+def _select_scalars(*queries: str) -> str:
+    """Combine single-value queries into one row so they cost one round trip"""
+    selects = []
+    for i, query in enumerate(queries):
+        query = _BIND_PARAM.sub(rf":\g<1>_{i}", query)
+        selects.append(f"({query})")
+    return "SELECT " + ", ".join(selects)
+
+
+def _suffix_params(*params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        f"{name}_{i}": value
+        for i, query_params in enumerate(params)
+        for name, value in query_params.items()
+    }
+
+
+def _compile_queries(queries: Dict[str, str]) -> Mapping[str, TextClause]:
+    queries = {name: textwrap.dedent(query).strip() for name, query in queries.items()}
+    queries["counts"] = _select_scalars(
+        queries["columns_count"],
+        queries["foreign_key_count"],
+        queries["foreign_key_count"],
+    )
+    return MappingProxyType({name: text(query) for name, query in queries.items()})
+
+
+DIALECT_QUERIES = MappingProxyType(
+    {dialect: _compile_queries(queries) for dialect, queries in DIALECT_QUERIES.items()}
+)
+
+_SQLITE_SCHEMA_VERSION = text("PRAGMA schema_version")
+
+
+def _foreign_key_params(
+    table_name: str, db_schema: str, outgoing: bool
+) -> Dict[str, str]:
+    """Bind a foreign_key query to one table's outgoing or incoming keys"""
+    if outgoing:
+        return {
+            "source_table_name": table_name,
+            "dest_table_name": "",
+            "source_schema_name": db_schema,
+            "dest_schema_name": "",
+        }
+    return {
+        "source_table_name": "",
+        "dest_table_name": table_name,
+        "source_schema_name": "",
+        "dest_schema_name": db_schema,
+    }
+
+
+class _ForeignKeyIndex(NamedTuple):
+    """Foreign key rows of a whole database grouped by source and target table"""
+
+    schema_version: int
+    by_source: Dict[str, List[tuple]]
+    by_target: Dict[str, List[tuple]]
+
+    @classmethod
+    def build(cls, schema_version: int, rows: List[tuple]) -> "_ForeignKeyIndex":
+        by_source, by_target = defaultdict(list), defaultdict(list)
+        for row in rows:
+            by_source[row[1]].append(row)
+            by_target[row[4]].append(row)
+        return cls(schema_version, dict(by_source), dict(by_target))
+
+    def rows_for(self, table_name: str, outgoing: bool) -> List[tuple]:
+        rows_by_table = self.by_source if outgoing else self.by_target
+        return rows_by_table.get(table_name, [])
+
+
+_sqlite_fk_index: "weakref.WeakKeyDictionary[Any, _ForeignKeyIndex]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def _get_sqlite_foreign_key_index(
+    db_manager: DatabaseManager, database: str, queries: Mapping[str, TextClause]
+) -> _ForeignKeyIndex:
+    """Get every foreign key in a SQLite database, reusing the last walk
+    until the schema version changes"""
     try:
-        pk_query = queries["primary_key"].format(
-            table_name=table_name, schema_name=db_schema
+        engine = db_manager.get_engine(database)
+        version_result = await db_manager.execute_query(
+            database, _SQLITE_SCHEMA_VERSION
+        )
+        schema_version = version_result.scalar()
+        cached = _sqlite_fk_index.get(engine)
+        if cached is not None and cached.schema_version == schema_version:
+            return cached
+
+        result = await db_manager.execute_query(
+            database,
+            queries["foreign_key"],
+            {**_foreign_key_params("", "", outgoing=True), "limit": -1, "offset": 0},
+        )
+        fk_index = _ForeignKeyIndex.build(
+            schema_version, [tuple(row) for row in result.fetchall()]
         )
-        result = await db_manager.execute_query(database, pk_query)
-        rows = result.fetchall()
-        return {row[0] for row in rows}
+        _sqlite_fk_index[engine] = fk_index
+        return fk_index
     except Exception as e:
         raise DescribeTableError(
-            f"Failed to get primary keys for table '{table_name}' in database '{database}': {str(e)}"
+            f"Failed to get foreign keys in database '{database}': {str(e)}"
         ) from e
 
 
@@ -430,35 +529,35 @@ async def _get_columns(
     database: str,
     table_name: str,
     db_schema: str,
-    dialect: str,
-    queries: dict,
-    primary_keys: set,
+    queries: Mapping[str, TextClause],
     limit: int,
     offset: int,
 ) -> List[ColumnInfo]:
     """Get column information for a table"""
     try:
-        query = queries["columns"].format(
-            table_name=table_name,
-            schema_name=db_schema,
-            limit=limit,
-            offset=offset,
+        rows = await db_manager.execute_schema_query(
+            database,
+            queries["columns"],
+            {
+                "table_name": table_name,
+                "schema_name": db_schema,
+                "limit": limit,
+                "offset": offset,
+            },
         )
-        result = await db_manager.execute_query(database, query)
-        rows = result.fetchall()
 
         columns = []
         for row in rows:
-            column_name = row[0]
-            data_type = row[1]
+            column_name = str(row[0])
+            data_type = str(row[1])
             is_nullable = row[2]
-            column_default = row[3]
+            column_default = str(row[3]) if row[3] is not None else None
 
             nullable = is_nullable == "YES" if is_nullable else True
-            is_primary_key = column_name in primary_keys
+            is_primary_key = bool(row[4])
 
             columns.append(
-                ColumnInfo(
+                ColumnInfo.model_construct(
                     name=column_name,
                     type=data_type,
                     nullable=nullable,
@@ -473,88 +572,30 @@ async def _get_columns(
         ) from e
 
 
-async def _get_foreign_keys(
+async def _get_foreign_key_rows(
     db_manager: DatabaseManager,
     database: str,
     table_name: str,
     db_schema: str,
-    dialect: str,
-    queries: dict,
+    queries: Mapping[str, TextClause],
     limit: int,
     offset: int,
     outgoing: bool = True,
-) -> List[ForeignKey] | List[IncomingForeignKey]:
-    """Get foreign key information (outgoing or incoming)"""
+    fk_index: _ForeignKeyIndex | None = None,
+) -> List[tuple]:
+    """Get one page of foreign key column rows (outgoing or incoming)"""
     try:
-        if outgoing:
-            query = queries["foreign_key"].format(
-                source_table_name=table_name,
-                dest_table_name="",
-                source_schema_name=db_schema,
-                dest_schema_name="",
-                limit=limit,
-                offset=offset,
-            )
-        else:
-            query = queries["foreign_key"].format(
-                source_table_name="",
-                dest_table_name=table_name,
-                source_schema_name="",
-                dest_schema_name=db_schema,
-                limit=limit,
-                offset=offset,
-            )
-
-        result = await db_manager.execute_query(database, query)
-        rows = result.fetchall()
-
-        if outgoing:
-            fks = []
-            fk_groups = {}
-            for row in rows:
-                constraint_name = row[6]
-                if constraint_name not in fk_groups:
-                    fk_groups[constraint_name] = {
-                        "constrained_columns": [],
-                        "referred_table": row[4],
-                        "referred_columns": [],
-                    }
-                fk_groups[constraint_name]["constrained_columns"].append(row[2])
-                fk_groups[constraint_name]["referred_columns"].append(row[5])
-
-            for constraint_name, fk_data in fk_groups.items():
-                fks.append(
-                    ForeignKey(
-                        constrained_columns=fk_data["constrained_columns"],
-                        referred_table=fk_data["referred_table"],
-                        referred_columns=fk_data["referred_columns"],
-                    )
-                )
-            return fks
-        else:
-            incoming_fks = []
-            fk_groups = {}
-            for row in rows:
-                constraint_name = row[6]
-                from_table = row[1]
-                if constraint_name not in fk_groups:
-                    fk_groups[constraint_name] = {
-                        "from_table": from_table,
-                        "from_columns": [],
-                        "to_columns": [],
-                    }
-                fk_groups[constraint_name]["from_columns"].append(row[2])
-                fk_groups[constraint_name]["to_columns"].append(row[5])
-
-            for constraint_name, fk_data in fk_groups.items():
-                incoming_fks.append(
-                    IncomingForeignKey(
-                        from_table=fk_data["from_table"],
-                        from_columns=fk_data["from_columns"],
-                        to_columns=fk_data["to_columns"],
-                    )
-                )
-            return incoming_fks
+        if fk_index is not None:
+            return fk_index.rows_for(table_name, outgoing)[offset:][:limit]
+        return await db_manager.execute_schema_query(
+            database,
+            queries["foreign_key"],
+            {
+                **_foreign_key_params(table_name, db_schema, outgoing),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
     except Exception as e:
         fk_type = "outgoing" if outgoing else "incoming"
         raise DescribeTableError(
@@ -562,44 +603,69 @@ async def _get_foreign_keys(
         ) from e
 
 
+def _group_foreign_keys(
+    rows: List[tuple], outgoing: bool
+) -> List[ForeignKey] | List[IncomingForeignKey]:
+    """Fold foreign key column rows into one model per constraint"""
+    if outgoing:
+        fks: Dict[Any, ForeignKey] = {}
+        for row in rows:
+            fk = fks.get(row[6])
+            if fk is None:
+                fk = fks[row[6]] = ForeignKey.model_construct(
+                    constrained_columns=[],
+                    referred_table=str(row[4]),
+                    referred_columns=[],
+                )
+            fk.constrained_columns.append(str(row[2]))
+            fk.referred_columns.append(str(row[5]))
+        return list(fks.values())
+
+    incoming_fks: Dict[Any, IncomingForeignKey] = {}
+    for row in rows:
+        fk = incoming_fks.get(row[6])
+        if fk is None:
+            fk = incoming_fks[row[6]] = IncomingForeignKey.model_construct(
+                from_table=str(row[1]),
+                from_columns=[],
+                to_columns=[],
+            )
+        fk.from_columns.append(str(row[2]))
+        fk.to_columns.append(str(row[5]))
+    return list(incoming_fks.values())
+
+
 async def _get_counts(
     db_manager: DatabaseManager,
     database: str,
     table_name: str,
     db_schema: str,
-    dialect: str,
-    queries: dict,
+    queries: Mapping[str, TextClause],
+    fk_index: _ForeignKeyIndex | None = None,
 ) -> tuple[int, int, int]:
     """Get counts for columns, outgoing FKs, and incoming FKs"""
     try:
-        column_count_query = queries["columns_count"].format(
-            table_name=table_name, schema_name=db_schema
-        )
-        outgoing_fk_count_query = queries["foreign_key_count"].format(
-            source_table_name=table_name,
-            dest_table_name="",
-            source_schema_name=db_schema,
-            dest_schema_name="",
-        )
-        incoming_fk_count_query = queries["foreign_key_count"].format(
-            source_table_name="",
-            dest_table_name=table_name,
-            source_schema_name="",
-            dest_schema_name=db_schema,
-        )
+        column_params = {"table_name": table_name, "schema_name": db_schema}
+        if fk_index is not None:
+            column_rows = await db_manager.execute_schema_query(
+                database, queries["columns_count"], column_params
+            )
+            return (
+                column_rows[0][0],
+                len(fk_index.rows_for(table_name, outgoing=True)),
+                len(fk_index.rows_for(table_name, outgoing=False)),
+            )
 
-        column_result = await db_manager.execute_query(database, column_count_query)
-        outgoing_fk_result = await db_manager.execute_query(
-            database, outgoing_fk_count_query
+        count_params = _suffix_params(
+            column_params,
+            _foreign_key_params(table_name, db_schema, outgoing=True),
+            _foreign_key_params(table_name, db_schema, outgoing=False),
         )
-        incoming_fk_result = await db_manager.execute_query(
-            database, incoming_fk_count_query
+        count_rows = await db_manager.execute_schema_query(
+            database, queries["counts"], count_params
         )
 
-        column_count = column_result.scalar()
-        outgoing_fk_count = outgoing_fk_result.scalar()
-        incoming_fk_count = incoming_fk_result.scalar()
-
+        column_count, outgoing_fk_count, incoming_fk_count = count_rows[0]
         return column_count, outgoing_fk_count, incoming_fk_count
     except Exception as e:
         raise DescribeTableError(
@@ -612,15 +678,15 @@ async def _check_table_exists(
     database: str,
     table_name: str,
     db_schema: str,
-    queries: dict,
+    queries: Mapping[str, TextClause],
 ) -> bool:
     """Check if a table exists using a simple query"""
     try:
-        query = queries["table_exists"].format(
-            table_name=table_name, schema_name=db_schema
+        rows = await db_manager.execute_schema_query(
+            database,
+            queries["table_exists"],
+            {"table_name": table_name, "schema_name": db_schema},
         )
-        result = await db_manager.execute_query(database, query)
-        rows = result.fetchall()
         return len(rows) > 0
     except Exception as e:
         raise DescribeTableError(
@@ -628,6 +694,90 @@ async def _check_table_exists(
         ) from e
 
 
+def _page_windows(
+    section_counts: tuple[int, ...], limit: int, offset: int
+) -> List[tuple[int, int]]:
+    """Split one page of rows across consecutive sections as (count, offset) pairs"""
+    windows = []
+    remaining = limit
+    for section_count in section_counts:
+        if offset < section_count and remaining > 0:
+            to_fetch = min(remaining, section_count - offset)
+            windows.append((to_fetch, offset))
+            remaining -= to_fetch
+            offset = 0
+        else:
+            windows.append((0, 0))
+            offset -= section_count
+    return windows
+
+
+async def _no_rows() -> list:
+    return []
+
+
+async def _get_page_sections(
+    db_manager: DatabaseManager,
+    database: str,
+    table_name: str,
+    db_schema: str,
+    queries: Mapping[str, TextClause],
+    fk_index: _ForeignKeyIndex | None,
+    windows: List[tuple[int, int]],
+) -> tuple[List[ColumnInfo], List[tuple], List[tuple]]:
+    """Fetch the column, outgoing FK and incoming FK rows in each (count, offset) window"""
+    (
+        (columns_to_fetch, columns_offset),
+        (fks_to_fetch, fks_offset),
+        (incoming_fks_to_fetch, incoming_fks_offset),
+    ) = windows
+    return await asyncio.gather(
+        (
+            _get_columns(
+                db_manager,
+                database,
+                table_name,
+                db_schema,
+                queries,
+                columns_to_fetch,
+                columns_offset,
+            )
+            if columns_to_fetch
+            else _no_rows()
+        ),
+        (
+            _get_foreign_key_rows(
+                db_manager,
+                database,
+                table_name,
+                db_schema,
+                queries,
+                fks_to_fetch,
+                fks_offset,
+                outgoing=True,
+                fk_index=fk_index,
+            )
+            if fks_to_fetch
+            else _no_rows()
+        ),
+        (
+            _get_foreign_key_rows(
+                db_manager,
+                database,
+                table_name,
+                db_schema,
+                queries,
+                incoming_fks_to_fetch,
+                incoming_fks_offset,
+                outgoing=False,
+                fk_index=fk_index,
+            )
+            if incoming_fks_to_fetch
+            else _no_rows()
+        ),
+    )
+
+
 async def describe_table(
     db_manager: DatabaseManager,
     database: str,
@@ -657,90 +807,55 @@ async def describe_table(
 
     schema_value = db_schema if db_schema else ""
 
-    table_exists = await _check_table_exists(
-        db_manager, database, table_name, schema_value, queries
-    )
-    if not table_exists:
-        raise TableNotFoundError(
-            f"Table '{table_name}' not found in database '{database}'"
-        )
-
-    column_count, outgoing_fk_count, incoming_fk_count = await _get_counts(
-        db_manager, database, table_name, schema_value, dialect, queries
-    )
-
-    total_count = column_count + outgoing_fk_count + incoming_fk_count
-    total_pages = math.ceil(total_count / limit) if total_count > 0 else 1
-
-    offset = (page - 1) * limit
-
-    columns = []
-    foreign_keys = []
-    incoming_foreign_keys = []
-
-    primary_keys = await _get_primary_keys(
-        db_manager, database, table_name, schema_value, dialect, queries
-    )
+    fk_index = None
+    if dialect == "sqlite":
+        fk_index = await _get_sqlite_foreign_key_index(db_manager, database, queries)
 
-    remaining_limit = limit
-    current_offset = offset
-
-    if current_offset < column_count and remaining_limit > 0:
-        columns_to_fetch = min(remaining_limit, column_count - current_offset)
-        columns = await _get_columns(
+    if page == 1:
+        sections = await _get_page_sections(
             db_manager,
             database,
             table_name,
             schema_value,
-            dialect,
             queries,
-            primary_keys,
-            columns_to_fetch,
-            current_offset,
+            fk_index,
+            [(limit + 1, 0)] * 3,
         )
-        remaining_limit -= len(columns)
-        current_offset = 0
-    else:
-        current_offset -= column_count
-
-    if current_offset < outgoing_fk_count and remaining_limit > 0:
-        fks_to_fetch = min(remaining_limit, outgoing_fk_count - current_offset)
-        foreign_keys = await _get_foreign_keys(
-            db_manager,
-            database,
-            table_name,
-            schema_value,
-            dialect,
-            queries,
-            fks_to_fetch,
-            current_offset,
-            outgoing=True,
+        if all(len(section) <= limit for section in sections):
+            counts = tuple(len(section) for section in sections)
+        else:
+            counts = await _get_counts(
+                db_manager, database, table_name, schema_value, queries, fk_index
+            )
+        windows = _page_windows(counts, limit, 0)
+        columns, fk_rows, incoming_fk_rows = (
+            section[:to_fetch] for section, (to_fetch, _) in zip(sections, windows)
         )
-        remaining_limit -= len(foreign_keys)
-        current_offset = 0
     else:
-        current_offset -= outgoing_fk_count
+        counts = await _get_counts(
+            db_manager, database, table_name, schema_value, queries, fk_index
+        )
+        windows = _page_windows(counts, limit, (page - 1) * limit)
+        columns, fk_rows, incoming_fk_rows = await _get_page_sections(
+            db_manager, database, table_name, schema_value, queries, fk_index, windows
+        )
 
-    if current_offset < incoming_fk_count and remaining_limit > 0:
-        incoming_fks_to_fetch = min(remaining_limit, incoming_fk_count - current_offset)
-        incoming_foreign_keys = await _get_foreign_keys(
-            db_manager,
-            database,
-            table_name,
-            schema_value,
-            dialect,
-            queries,
-            incoming_fks_to_fetch,
-            current_offset,
-            outgoing=False,
+    if counts[0] == 0 and not await _check_table_exists(
+        db_manager, database, table_name, schema_value, queries
+    ):
+        raise TableNotFoundError(
+            f"Table '{table_name}' not found in database '{database}'"
         )
 
+    total_count = sum(counts)
+    total_pages = max(1, (total_count + limit - 1) // limit)
+
     table_ref = f"{db_schema}.{table_name}" if db_schema else table_name
     return TableDescription(
         table=table_ref,
         columns=columns,
-        foreign_keys=foreign_keys,
-        incoming_foreign_keys=incoming_foreign_keys,
+        foreign_keys=_group_foreign_keys(fk_rows, outgoing=True),
+        incoming_foreign_keys=_group_foreign_keys(incoming_fk_rows, outgoing=False),
         total_count=total_count,
         current_page=page,
         total_pages=total_pages,
@@ -1,11 +1,14 @@
-from typing import Dict, Any, List
+from typing import Any, List
+import re
 from pydantic import BaseModel
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, _LEADING_COMMENTS
+
+_SCHEMA_CHANGE = re.compile(r"(create|drop|alter|rename|truncate)\b", re.IGNORECASE)
 
 
 class QueryResponse(BaseModel):
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: List[List[Any]]
     row_count: int
     truncated: bool
 
@@ -17,17 +20,21 @@ async def execute_query(
 
     max_rows = db_manager.config.settings.get("max_rows_per_query", 1000)
 
-    result = await db_manager.execute_query(database, query)
-    rows = result.fetchmany(max_rows)
-    columns = list(result.keys())
+    try:
+        columns, rows = await db_manager.fetch_rows_cached(
+            database, query, max_rows + 1
+        )
+    finally:
+        # DDL returns no rows and so fails to fetch, but may still have run
+        if _SCHEMA_CHANGE.match(query, _LEADING_COMMENTS.match(query).end()):
+            db_manager.clear_schema_cache(database)
+    truncated = len(rows) > max_rows
 
-    data = []
-    for row in rows:
-        data.append(dict(zip(columns, row)))
+    data = [list(row) for row in rows[:max_rows]]
 
-    return QueryResponse(
+    return QueryResponse.model_construct(
         columns=columns,
         rows=data,
         row_count=len(data),
-        truncated=len(data) == max_rows,
+        truncated=truncated,
     )
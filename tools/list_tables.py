@@ -1,6 +1,10 @@
 from typing import List
-import math
+from types import MappingProxyType
+from itertools import groupby
+from operator import itemgetter
+import textwrap
 from pydantic import BaseModel
+from sqlalchemy import text
 from database_manager import DatabaseManager
 
 
@@ -11,46 +15,55 @@ class ListTablesError(Exception):
 DIALECT_QUERIES = {
     "postgresql": {
         "list": """
-            SELECT schemaname as schema_name, tablename as table_name
+            SELECT schemaname as schema_name, tablename as table_name,
+                COUNT(*) OVER () as total_count
             FROM pg_tables
             WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            AND ('{schema_name}' = '' OR schemaname = '{schema_name}')
+            AND (:schema_name = '' OR schemaname = :schema_name)
             ORDER BY schemaname, tablename
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "count": """
             SELECT COUNT(*)
             FROM pg_tables
             WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-            AND ('{schema_name}' = '' OR schemaname = '{schema_name}')
+            AND (:schema_name = '' OR schemaname = :schema_name)
         """,
     },
     "mysql": {
         "list": """
-            SELECT table_schema as schema_name, table_name
+            SELECT table_schema as schema_name, table_name,
+                (
+                    SELECT COUNT(*)
+                    FROM information_schema.tables
+                    WHERE table_type = 'BASE TABLE'
+                    AND table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+                    AND (:schema_name = '' OR table_schema = :schema_name)
+                ) as total_count
             FROM information_schema.tables
             WHERE table_type = 'BASE TABLE'
             AND table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
             ORDER BY table_schema, table_name
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "count": """
             SELECT COUNT(*)
             FROM information_schema.tables
             WHERE table_type = 'BASE TABLE'
             AND table_schema NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
         """,
     },
     "sqlite": {
         "list": """
-            SELECT 'main' as schema_name, name as table_name
+            SELECT 'main' as schema_name, name as table_name,
+                COUNT(*) OVER () as total_count
             FROM sqlite_master
             WHERE type = 'table'
             AND name NOT LIKE 'sqlite_%'
             ORDER BY name
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "count": """
             SELECT COUNT(*)
@@ -61,42 +74,56 @@ DIALECT_QUERIES = {
     },
     "mssql": {
         "list": """
-            SELECT s.name as schema_name, t.name as table_name
+            SELECT s.name as schema_name, t.name as table_name,
+                COUNT(*) OVER () as total_count
             FROM sys.tables t
             INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
+            AND (:schema_name = '' OR s.name = :schema_name)
             ORDER BY s.name, t.name
-            OFFSET {offset} ROWS FETCH NEXT {limit} ROWS ONLY
+            OFFSET :offset ROWS FETCH NEXT :limit ROWS ONLY
         """,
         "count": """
             SELECT COUNT(*)
             FROM sys.tables t
             INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
             WHERE s.name NOT IN ('information_schema', 'sys')
-            AND ('{schema_name}' = '' OR s.name = '{schema_name}')
+            AND (:schema_name = '' OR s.name = :schema_name)
         """,
     },
     "snowflake": {
         "list": """
-            SELECT table_schema as schema_name, table_name
+            SELECT table_schema as schema_name, table_name,
+                COUNT(*) OVER () as total_count
             FROM information_schema.tables
             WHERE table_type = 'BASE TABLE'
             AND table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
             ORDER BY table_schema, table_name
-            LIMIT {limit} OFFSET {offset}
+            LIMIT :limit OFFSET :offset
         """,
         "count": """
             SELECT COUNT(*)
             FROM information_schema.tables
             WHERE table_type = 'BASE TABLE'
             AND table_schema NOT IN ('INFORMATION_SCHEMA')
-            AND ('{schema_name}' = '' OR table_schema = '{schema_name}')
+            AND (:schema_name = '' OR table_schema = :schema_name)
         """,
     },
 }
 
+DIALECT_QUERIES = MappingProxyType(
+    {
+        dialect: MappingProxyType(
+            {
+                name: text(textwrap.dedent(query).strip())
+                for name, query in queries.items()
+            }
+        )
+        for dialect, queries in DIALECT_QUERIES.items()
+    }
+)
+
 
 class SchemaInfo(BaseModel):
     db_schema: str
@@ -161,34 +188,32 @@ async def list_tables(
 
     schema_value = schema if schema else ""
 
-    count_query = queries["count"].format(schema_name=schema_value)
-    list_query = queries["list"].format(
-        schema_name=schema_value, limit=limit, offset=offset
-    )
+    params = {"schema_name": schema_value}
 
     try:
-        count_result = await db_manager.execute_query(database, count_query)
-        total_count = count_result.scalar()
-
-        list_result = await db_manager.execute_query(database, list_query)
-        rows = list_result.fetchall()
-
-        schema_tables = {}
-        for row in rows:
-            schema_name = row[0]
-            table_name = row[1]
-            if schema_name not in schema_tables:
-                schema_tables[schema_name] = []
-            schema_tables[schema_name].append(table_name)
+        rows = await db_manager.execute_schema_query(
+            database, queries["list"], {**params, "limit": limit, "offset": offset}
+        )
+        if rows:
+            total_count = rows[0][2]
+        elif offset == 0:
+            total_count = 0
+        else:
+            count_rows = await db_manager.execute_schema_query(
+                database, queries["count"], params
+            )
+            total_count = count_rows[0][0]
 
         schemas = [
-            SchemaInfo(db_schema=schema_name, tables=tables)
-            for schema_name, tables in schema_tables.items()
+            SchemaInfo.model_construct(
+                db_schema=schema_name, tables=[row[1] for row in schema_rows]
+            )
+            for schema_name, schema_rows in groupby(rows, key=itemgetter(0))
         ]
 
-        total_pages = math.ceil(total_count / limit) if total_count > 0 else 1
+        total_pages = max(1, (total_count + limit - 1) // limit)
 
-        return TablesResponse(
+        return TablesResponse.model_construct(
             database=database,
             schemas=schemas,
             total_count=total_count,
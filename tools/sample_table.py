@@ -1,4 +1,5 @@
-from typing import Dict, Any, List
+from typing import Any, List
+from functools import cached_property
 from pydantic import BaseModel
 from database_manager import DatabaseManager
 
@@ -6,9 +7,13 @@ from database_manager import DatabaseManager
 class SampleResponse(BaseModel):
     table: str
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: List[List[Any]]
     row_count: int
 
+    @cached_property
+    def column_names(self) -> frozenset[str]:
+        return frozenset(self.columns)
+
 
 class SampleTableError(Exception):
     pass
@@ -23,18 +28,21 @@ async def sample_table(
     sample_size = db_manager.config.settings.get("sample_size", 10)
 
     table_ref = f"{db_schema}.{table_name}" if db_schema else table_name
-    query = f"SELECT * FROM {table_ref} LIMIT {sample_size}"
 
     try:
-        result = await db_manager.execute_query(database, query)
-        rows = result.fetchall()
-        columns = list(result.keys())
-
-        data = []
-        for row in rows:
-            data.append(dict(zip(columns, row)))
+        quoted_ref = db_manager.quote_identifier(database, table_name)
+        if db_schema:
+            quoted_ref = (
+                f"{db_manager.quote_identifier(database, db_schema)}.{quoted_ref}"
+            )
+        query = f"SELECT * FROM {quoted_ref} LIMIT :limit"
+
+        columns, rows = await db_manager.fetch_rows(
+            database, query, sample_size, {"limit": sample_size}
+        )
+        data = [list(row) for row in rows]
 
-        return SampleResponse(
+        return SampleResponse.model_construct(
             table=table_ref, columns=columns, rows=data, row_count=len(data)
         )
     except Exception as e: